@@ -12,18 +12,37 @@
 
 
 ### INITIALIZATIONS ###
-from game import Game
+import time
+launch_time = time.perf_counter()  # Start of the startup report, before the slower imports
+
+from audio import AudioBank
+from fonts import render_text
+from grid import Grid
+from instrumentation import StartupReport, configure_logging
+from scenes import Scene, SceneStack
+from stats import Stats
 import pygame as pg
-import pygame_gui as pgg
+import logging
 import sys
-import os
 
-pg.init()
+# pygame_gui and the game module are imported when their screens first open, so the menu does not wait for them
+
+configure_logging()  # Leveled logging instead of print, WANDERING_LOG_LEVEL=DEBUG shows everything
+logger = logging.getLogger("Main")
+startup = StartupReport(launch_time)
+startup.mark("imports")
+
+pg.display.init()  # Only the subsystems the menu needs; the mixer starts with the first prompt (audio.AudioBank)
 pg.font.init()
+startup.mark("sdl init")
+
+# Fonts are (face, size) keys into the shared font and text cache in fonts.py
+main_font = ('Verdana', 10)
+large_font = ('Verdana', 18)
+x_large_font = ('Verdana', 32)
+
+audio_bank = AudioBank()  # Mixer is initialized once, prompts are cached after their first load
 
-main_font = pg.font.SysFont('Verdana', 10)
-large_font = pg.font.SysFont('Verdana', 18)
-x_large_font = pg.font.SysFont('Verdana', 32)
 
 
 ### CLASS CREATIONS ###
@@ -40,13 +59,13 @@ class MenuButton():
     def draw(self, window):  # Draws rectangle of w width and h height at (x,y)
         button_image = pg.Rect(self._x, self._y, self._w, self._h)
         pg.draw.rect(window, ("dimgrey"), button_image, width=3, border_radius=5)
-        display_text = main_font.render(self._text, False, color="dimgrey")  # Draws text onto button
+        display_text = render_text(self._text, main_font, "dimgrey", False)  # Draws text onto button
         window.blit(display_text, (self._x + 7, self._y + 3))
 
     def draw_large(self, window):  # Draws rectangle of w width and h height at (x,y) with larger text
         button_image = pg.Rect(self._x, self._y, self._w, self._h)
         pg.draw.rect(window, ("dimgrey"), button_image, width=3, border_radius=5)
-        display_text = large_font.render(self._text, False, color="dimgrey")  # Draws text onto button
+        display_text = render_text(self._text, large_font, "dimgrey", False)  # Draws text onto button
         window.blit(display_text, (self._x + 7, self._y + 3))
 
 ### FUNCTION CREATIONS ###
@@ -56,176 +75,175 @@ class MenuButton():
 ### WINDOW CREATIONS ###
 
 # Function for playing specified audio file in AudioFiles folder
+# Sounds are decoded on first use and then played from memory (see audio.AudioBank)
 def play_audio_file(fileName):
-    pg.mixer.init()
-
-    current_directory = os.path.dirname(os.path.abspath(__file__))
-    mp3_file_path = os.path.join(current_directory, "AudioFiles" , fileName)
-
-    #checks if audio is already playing
-    if pg.mixer.music.get_busy():
-        pg.mixer.music.stop()  # Stop any music that might already be playing
-
-    try:
-        # Load and play MP3 file once
-        pg.mixer.music.load(mp3_file_path)
-        pg.mixer.music.play(loops=0)
-
-    except Exception as e:
-        print(f"Error loading or playing the file: {e}")
+    audio_bank.play(fileName)
     return None
 
 ### WINDOW CREATIONS ###
 
-## About Window function creates a new screen that displays basic information about how the game is played ##
-def about_window():
-    about_screen = pg.display.set_mode((325,325))   #Initializes the window and background
-    pg.display.set_caption("How to Play")
-    background = pg.Surface((325,325))
-    background.fill("whitesmoke")
-    about_screen.blit(background,(0,0))
-
-    return_button = MenuButton(225, 25, 75, 25, "Main Menu")  # Creates button to return to the main menu and About text
-    return_button.draw(about_screen)
-
-    About = [   # Short game Description
-        "Wandering in the Woods is a game where players must",
-        "try to find each other in the dark and ominous woods.",
-        "It is very dark in the woods, so you must wander",
-        "aimlessly. Can you find your friends?"
-    ]
-
-    How_to_Play = [ # How to play- susceptible to change
-        "How to Play:",
-        "1. Select the complexity (K-2, 3-5, 6-8).",
-        "2. Select the grid size and number of players (2-5 and up).",
-        "3. Select each player's starting coordinates (2-5 and up).",
-        "4. Watch as players wander aimlessly through the woods.",
-        "5. The goal is to reach all of your friends in the woods.",
-        "6. Have fun and good luck!"
-    ]
-
-    # Draw the text
-    y_offset = 60  # Start position for the first line of text 
-   
-    for line in About:
-        text_surface = main_font.render(line, True, (0,0,0))
-        about_screen.blit(text_surface, (20, y_offset))
-        y_offset+=10
-    
-    y_offset+=20 # Extra spacing between how to play 
-
-    for line in How_to_Play:  ## Loop that prints each line in how to play txt
-        text_surface = main_font.render(line, True, (0, 0, 0))  # Black color for text
-        about_screen.blit(text_surface, (20, y_offset))  # Draw text with an offset
-        y_offset += 30  # Increase y position for the next line of text
-
-    # Update the display
-    play_audio_file("About.mp3")
-    pg.display.flip()
-    
-    running = True
-   
-    while running:
-
-        events = pg.event.get() #The same loop is used for every window; every display refresh gets events
-        for event in events:
-            if event.type == pg.QUIT:   #No longer running if x-ed out 
-                running = False
-
-            if event.type == pg.MOUSEBUTTONDOWN:    #The same event type is used to check for user mouse clicks
-                mouse_pos = pg.mouse.get_pos()  
-
-                if (250 <= mouse_pos[0] <=300) and (25 <= mouse_pos[1] <= 50):  #The same if-statement is used to check for button clicks
-                    running = False   #No longer running if Main Menu Button is pressed
-
-        pg.display.update()
-    main_game_gui()     #Runs the Main Game function and returns to main menu when no longer running
-
-## Selection Window function creates a new screen where players select the width and height of the grid (between 1 and 20) ##
+## About Window scene creates a new screen that displays basic information about how the game is played ##
+class AboutScene(Scene):
+    size = (325, 325)
+    caption = "How to Play"
+    wait_timeout = 0  # Nothing moves on this screen, so it sleeps until the user does something
+
+    def enter(self):
+        super().enter()     #Initializes the window and background
+        about_screen = self.screen
+        background = pg.Surface((325,325))
+        background.fill("whitesmoke")
+        about_screen.blit(background,(0,0))
+
+        return_button = MenuButton(225, 25, 75, 25, "Main Menu")  # Creates button to return to the main menu and About text
+        return_button.draw(about_screen)
+
+        About = [   # Short game Description
+            "Wandering in the Woods is a game where players must",
+            "try to find each other in the dark and ominous woods.",
+            "It is very dark in the woods, so you must wander",
+            "aimlessly. Can you find your friends?"
+        ]
+
+        How_to_Play = [ # How to play- susceptible to change
+            "How to Play:",
+            "1. Select the complexity (K-2, 3-5, 6-8).",
+            "2. Select the grid size and number of players (2-5 and up).",
+            "3. Select each player's starting coordinates (2-5 and up).",
+            "4. Watch as players wander aimlessly through the woods.",
+            "5. The goal is to reach all of your friends in the woods.",
+            "6. Have fun and good luck!"
+        ]
+
+        # Draw the text
+        y_offset = 60  # Start position for the first line of text
+
+        for line in About:
+            text_surface = render_text(line, main_font, (0,0,0), True)
+            about_screen.blit(text_surface, (20, y_offset))
+            y_offset+=10
+
+        y_offset+=20 # Extra spacing between how to play
+
+        for line in How_to_Play:  ## Loop that prints each line in how to play txt
+            text_surface = render_text(line, main_font, (0, 0, 0), True)  # Black color for text
+            about_screen.blit(text_surface, (20, y_offset))  # Draw text with an offset
+            y_offset += 30  # Increase y position for the next line of text
+
+        play_audio_file("About.mp3")  # The scene stack shows the finished screen
+
+    def handle_event(self, event):  #The same handler is used for every window; the scene stack passes it each event
+        if event.type == pg.QUIT:   #Back to the main menu if x-ed out
+            self.stack.pop()
+
+        if event.type == pg.MOUSEBUTTONDOWN:    #The same event type is used to check for user mouse clicks
+            mouse_pos = event.pos
+
+            if (250 <= mouse_pos[0] <=300) and (25 <= mouse_pos[1] <= 50):  #The same if-statement is used to check for button clicks
+                self.stack.pop()   #Returns to the main menu when the Main Menu Button is pressed
+
+## Selection Window scene creates a new screen where players select the width and height of the grid (between 1 and 20) ##
 ## as well as selects between 2, 3, and 4 players before moving onto the next set of selections ##
-def selection_window():
-    str_item_list = [str(i) for i in range(5, 21)]  # Value inits
-    grid_width_bool = False
-    grid_height_bool = False
-    player_number_bool = False
-
-    selection_screen = pg.display.set_mode((400, 300))  # Screen inits
-    pg.display.set_caption("Gameplay Selection")
-    background = pg.Surface((400, 300))
-    background.fill("whitesmoke")
-    selection_screen.blit(background, (0, 0))
-    pgmanager = pgg.UIManager((400, 300))  # Manager to check for UI selection list selections
-    selection_clock = pg.time.Clock()
-    refresh = selection_clock.tick(60) / 1000
-    width_text = large_font.render("Grid Width", False, color="dimgrey")  # Text inits
-    selection_screen.blit(width_text, (25, 75))
-    height_text = large_font.render("Grid Height", False, color="dimgrey")
-    selection_screen.blit(height_text, (150, 75))
-    player_text = large_font.render("# of Players", False, color="dimgrey")
-    selection_screen.blit(player_text, (265, 75))
-
-    # Creates 3 UI selection lists of allowed integer values for grid width, grid height, and # of players respectively
-    width_box = pgg.elements.UISelectionList(relative_rect=pg.Rect(25, 100, 100, 125), item_list=str_item_list,
-                                             manager=pgmanager, object_id="grid_width")
-    height_box = pgg.elements.UISelectionList(relative_rect=pg.Rect(150, 100, 100, 125), item_list=str_item_list,
-                                              manager=pgmanager, object_id="grid_height")
-    player_box = pgg.elements.UISelectionList(relative_rect=pg.Rect(275, 100, 100, 65), item_list=["2", "3", "4"],
-                                              manager=pgmanager, object_id="player_number")
-
-    continue_button = MenuButton(275, 175, 100, 50, "Continue")  # Button init
-    continue_button.draw_large(selection_screen)
-
-    play_audio_file("SelectPrompt.mp3")
-    running = True
-
-    while running:
-
-        events = pg.event.get()
-        for event in events:
-            if event.type == pg.QUIT:  # Returns to main menu if x-ed out
-                running = False
-
-            if event.type == pg.MOUSEBUTTONDOWN:
-                mouse_pos = pg.mouse.get_pos()
-
-                # Continues to next selection screen if all 3 selectinos have been made, and the continue button has been pressed
-                if grid_width_bool and grid_height_bool and player_number_bool and (275 <= mouse_pos[0] <= 375) and (
-                        175 <= mouse_pos[1] <= 225):
-                    grid_and_player_selection(int(grid_width), int(grid_height), int(player_number,))
-
-            elif event.type == pgg.UI_SELECTION_LIST_NEW_SELECTION and (
-                    25 <= mouse_pos[0] <= 125):  # Uses same elif statement where
-                grid_width = event.text  # events of new list selection type at correct UI box location
-                grid_width_bool = True  # updates appropriate variable as well as changes a bool to True
-                print(event.text)  # to make sure all necessary selections have been made
-
-            elif event.type == pgg.UI_SELECTION_LIST_NEW_SELECTION and (150 <= mouse_pos[0] <= 250):
-                grid_height = event.text
-                grid_height_bool = True
-                print(event.text)
-
-            elif event.type == pgg.UI_SELECTION_LIST_NEW_SELECTION and (275 <= mouse_pos[0] <= 375):
-                player_number = event.text
-                player_number_bool = True
-                print(event.text)
-
-            pgmanager.process_events(event)  # Used for pygame GUI events
-
-        pgmanager.update(refresh)  # Refreshes pgmanager with display update
-        pgmanager.draw_ui(selection_screen)  # Draws UI selection lists
-        pg.display.update()
-
-    main_game_gui()
-
-
-## Grid and Player Selection function creates a new window that takes in previously selected grid width, height, and # of players ##
+class SelectionScene(Scene):
+    size = (400, 300)
+    caption = "Gameplay Selection"
+    wait_timeout = 250  # Wakes for input, and a few times a second so the UI lists can finish their hover effects
+    shared_manager = None  # One pygame_gui manager for every visit, its themes and fonts are only loaded once
+
+    def __init__(self):
+        super().__init__()
+        self.pgmanager = None
+        self.new_selection = None  # pygame_gui's selection event type, known once the screen has been entered
+
+    def enter(self):
+        import pygame_gui as pgg  # Only loaded the first time a selection screen opens
+        self.new_selection = pgg.UI_SELECTION_LIST_NEW_SELECTION
+
+        super().enter()  # Screen inits
+        str_item_list = [str(i) for i in range(5, 21)]  # Value inits
+        self.grid_width = None
+        self.grid_height = None
+        self.player_number = None
+
+        selection_screen = self.screen
+        background = pg.Surface((400, 300))
+        background.fill("whitesmoke")
+        selection_screen.blit(background, (0, 0))
+        if SelectionScene.shared_manager is None:
+            SelectionScene.shared_manager = pgg.UIManager((400, 300))
+        self.pgmanager = SelectionScene.shared_manager  # Manager to check for UI selection list selections
+        width_text = render_text("Grid Width", large_font, "dimgrey", False)  # Text inits
+        selection_screen.blit(width_text, (25, 75))
+        height_text = render_text("Grid Height", large_font, "dimgrey", False)
+        selection_screen.blit(height_text, (150, 75))
+        player_text = render_text("# of Players", large_font, "dimgrey", False)
+        selection_screen.blit(player_text, (265, 75))
+
+        # Creates 3 UI selection lists of allowed integer values for grid width, grid height, and # of players respectively
+        self.width_box = pgg.elements.UISelectionList(relative_rect=pg.Rect(25, 100, 100, 125), item_list=str_item_list,
+                                                      manager=self.pgmanager, object_id="grid_width")
+        self.height_box = pgg.elements.UISelectionList(relative_rect=pg.Rect(150, 100, 100, 125), item_list=str_item_list,
+                                                       manager=self.pgmanager, object_id="grid_height")
+        self.player_box = pgg.elements.UISelectionList(relative_rect=pg.Rect(275, 100, 100, 65), item_list=["2", "3", "4"],
+                                                       manager=self.pgmanager, object_id="player_number")
+
+        continue_button = MenuButton(275, 175, 100, 50, "Continue")  # Button init
+        continue_button.draw_large(selection_screen)
+
+        play_audio_file("SelectPrompt.mp3")
+
+    def exit(self):  # Removes this visit's lists from the shared manager so nothing from this screen stays reachable
+        self.pgmanager.clear_and_reset()
+        self.pgmanager.ui_group.lostsprites.clear()  # Dirty rects of removed elements, pygame_gui never reads or clears them
+        self.pgmanager = None
+        self.width_box = self.height_box = self.player_box = None
+        super().exit()
+
+    def handle_event(self, event):
+        if event.type == pg.QUIT:  # Returns to main menu if x-ed out
+            self.stack.pop()
+            return
+
+        if event.type == pg.MOUSEBUTTONDOWN:
+            mouse_pos = event.pos
+
+            # Continues to next selection screen if all 3 selectinos have been made, and the continue button has been pressed
+            if self.grid_width and self.grid_height and self.player_number and (275 <= mouse_pos[0] <= 375) and (
+                    175 <= mouse_pos[1] <= 225):
+                self.stack.push(PlacementScene(int(self.grid_width), int(self.grid_height), int(self.player_number)))
+                return
+
+        elif event.type == self.new_selection and event.ui_element is self.width_box:  # Uses same elif statement where
+            self.grid_width = event.text  # events of new list selection type from the matching UI box
+            logger.debug(event.text)  # update the appropriate selection, all three are needed to continue
+
+        elif event.type == self.new_selection and event.ui_element is self.height_box:
+            self.grid_height = event.text
+            logger.debug(event.text)
+
+        elif event.type == self.new_selection and event.ui_element is self.player_box:
+            self.player_number = event.text
+            logger.debug(event.text)
+
+        self.pgmanager.process_events(event)  # Used for pygame GUI events
+
+    def update(self, dt):
+        self.pgmanager.update(dt)  # Refreshes pgmanager with display update
+
+    def draw(self):
+        self.pgmanager.draw_ui(self.screen)  # Draws UI selection lists
+        return True
+
+
+## Grid and Player Selection scene creates a new window that takes in previously selected grid width, height, and # of players ##
 ## and lets the user pick where each player will be starting on the grid ##
-def grid_and_player_selection(grid_width, grid_height, number_of_players, stats=None):
+class PlacementScene(Scene):
+    caption = "Player Selection"
+    wait_timeout = 0  # Only redrawn when a player picks a cell
 
     cell_size = 50  # Size of each grid cell
     grid_offset_x, grid_offset_y = 50, 100  # Where the grid starts
-    selected_positions = {}  # Store selected positions for players
+    background = (240, 240, 240)
 
     player_colors = {  # assign colors for players
         1: (255, 0, 0),  # Player 1 - Red
@@ -234,173 +252,166 @@ def grid_and_player_selection(grid_width, grid_height, number_of_players, stats=
         4: (255, 255, 0)  # Player 4 - Yellow
     }
 
-    selection_screen = pg.display.set_mode((375, 200 + 100 * number_of_players))  # Screen inits
-    pg.display.set_caption("Gameplay Selection")
-    background = pg.Surface((375, 200 + 100 * number_of_players))
-    background.fill("whitesmoke")
-    selection_screen.blit(background, (0, 0))
-    pgmanager = pgg.UIManager((375, 200 + 100 * number_of_players))  # GUI manager inits
-    selection_clock = pg.time.Clock()
-    refresh = selection_clock.tick(60) / 1000
-    matching_coords_text = large_font.render("Player coordinates cannot match!", None,
-                                             color="dimgrey")  # Text init for later
-
-    start_button = MenuButton(250, 150 + 100 * number_of_players, 90, 40, "Start!")  # Start Button init
-    start_button.draw_large(selection_screen)
-
-    pg.init()
-    min_extra_space = 100  #  extra space at the bottom for the button
-    window_height = max(grid_height * cell_size + min_extra_space, 600)  #  minimum height
-
-    selection_screen = pg.display.set_mode((grid_width * cell_size + 100, window_height))
-    pg.display.set_caption("Player Selection")
-
-    background = pg.Surface(selection_screen.get_size())
-    background.fill("whitesmoke")
-    selection_screen.blit(background, (0, 0))
-
-    pgmanager = pgg.UIManager(selection_screen.get_size())
-    selection_clock = pg.time.Clock()
-    refresh = selection_clock.tick(60) / 1000
-
-
-    button_padding = 200  # can move the button higher or lower
-    start_button_y = min(window_height - 60, grid_height * cell_size + button_padding)
-
-    start_button = MenuButton(selection_screen.get_width() // 2 - 45, start_button_y, 90, 40, "Start")
-
-    current_player = 1  # Start with Player 1
-
-    play_audio_file("SelectCoords.mp3")
-    running = True
-    while running:
-        selection_screen.fill((240, 240, 240))
+    def __init__(self, grid_width, grid_height, number_of_players, stats=None):
+        super().__init__()
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.number_of_players = number_of_players
+        self.stats = stats if stats else Stats()  # Shared by every game started from here (Play Again)
+        self.grid = Grid(grid_width, grid_height, self.cell_size)  # Grid lines are rendered once and reused on every redraw
+
+        min_extra_space = 100  #  extra space at the bottom for the button
+        self.window_height = max(grid_height * self.cell_size + min_extra_space, 600)  #  minimum height
+        self.size = (grid_width * self.cell_size + 100, self.window_height)
+
+    def enter(self):
+        super().enter()  # The only set_mode for this screen
+        self.selected_positions = {}  # Store selected positions for players
+        self.current_player = 1  # Start with Player 1
+        self.changed = True  # Board needs drawing
+
+        button_padding = 200  # can move the button higher or lower
+        start_button_y = min(self.window_height - 60, self.grid_height * self.cell_size + button_padding)
+
+        self.start_button = MenuButton(self.screen.get_width() // 2 - 45, start_button_y, 90, 40, "Start")
+
+        play_audio_file("SelectCoords.mp3")
+
+    def handle_event(self, event):
+        selected_positions = self.selected_positions
+        start_button = self.start_button
+
+        if event.type == pg.QUIT:
+            self.stack.pop_to_root()  # Back to the main menu if x-ed out
+            return
+
+        if event.type == pg.MOUSEBUTTONDOWN:
+            mouse_pos = event.pos
+
+            # Click grid: the cell comes straight from the offsets and cell size
+            cell = self.grid.cell_at(mouse_pos[0] - self.grid_offset_x, mouse_pos[1] - self.grid_offset_y)
+            if cell is not None and cell not in selected_positions.values():
+                selected_positions[self.current_player] = cell
+                self.changed = True
+                if self.current_player < self.number_of_players:
+                    self.current_player += 1
+
+            # Start game
+            if len(selected_positions) == self.number_of_players and (
+                    start_button._x <= mouse_pos[0] <= start_button._x + start_button._w
+            ) and (
+                    start_button._y <= mouse_pos[1] <= start_button._y + start_button._h
+            ):
+                logger.info("Game Starting with selected positions: %s", selected_positions)
+                from game import Game
+
+                game = Game(self.grid_width, self.grid_height, list(selected_positions.values()), stats=self.stats,
+                            cell_size=40)
+                self.stack.push(game)  # Play Again on the stats screen comes back here
+
+    def draw(self):
+        if not self.changed:
+            return None
+        self.changed = False
+        grid_offset_x, grid_offset_y = self.grid_offset_x, self.grid_offset_y
+        selection_screen = self.screen
+
+        selection_screen.fill(self.background)
         pg.draw.rect(selection_screen, (0, 0, 0),
-                     (grid_offset_x - 5, grid_offset_y - 5, grid_width * cell_size + 10, grid_height * cell_size + 10),
-                     3)
-
-        # Draw the grid
-        for x in range(grid_width):
-            for y in range(grid_height):
-                rect = pg.Rect(grid_offset_x + x * cell_size, grid_offset_y + y * cell_size, cell_size, cell_size)
-                pg.draw.rect(selection_screen, (0, 0, 0), rect, 1)
+                     (grid_offset_x - 5, grid_offset_y - 5, self.grid_width * self.cell_size + 10,
+                      self.grid_height * self.cell_size + 10), 3)
 
-                # If selected, fill cell with player's color
-                for player, pos in selected_positions.items():
-                    if pos == (x, y):
-                        pg.draw.rect(selection_screen, player_colors[player], rect)
+        # Draw the grid, then fill each selected cell with its player's color
+        selection_screen.blit(self.grid.surface(self.background), (grid_offset_x, grid_offset_y))
+        for player, (x, y) in self.selected_positions.items():
+            rect = self.grid.cell_rect(x, y).move(grid_offset_x, grid_offset_y)
+            pg.draw.rect(selection_screen, self.player_colors[player], rect)
 
-        instructions = large_font.render(f"Player {current_player}, click to choose starting position", True, (0, 0, 0))
+        instructions = render_text(f"Player {self.current_player}, click to choose starting position", large_font,
+                                   (0, 0, 0), True)
         selection_screen.blit(instructions, (50, 50))
-        start_button.draw_large(selection_screen)
-
-        events = pg.event.get()
-        for event in events:
-            if event.type == pg.QUIT:
-                running = False
-
-            if event.type == pg.MOUSEBUTTONDOWN:
-                mouse_pos = pg.mouse.get_pos()
-
-                # Click grid
-                for x in range(grid_width):
-                    for y in range(grid_height):
-                        rect = pg.Rect(grid_offset_x + x * cell_size, grid_offset_y + y * cell_size, cell_size,
-                                       cell_size)
-                        if rect.collidepoint(mouse_pos):
-                            if (x, y) not in selected_positions.values() and (x, y) not in selected_positions.keys():
-                                selected_positions[current_player] = (x, y)
-                                if current_player < number_of_players:
-                                    current_player += 1
-
-                # Start game
-                if len(selected_positions) == number_of_players and (
-                        start_button._x <= mouse_pos[0] <= start_button._x + start_button._w
-                ) and (
-                        start_button._y <= mouse_pos[1] <= start_button._y + start_button._h
-                ):
-                    print("Game Starting with selected positions:", selected_positions)
-
-
-                    game = Game(grid_width, grid_height, list(selected_positions.values()), stats=stats, cell_size=40,selection_func=grid_and_player_selection)
-
-                    game.run()
-            pgmanager.process_events(event)
+        self.start_button.draw_large(selection_screen)
+        return True
 
-        pgmanager.update(refresh)
-        pgmanager.draw_ui(selection_screen)
-        pg.display.update()
-
-    main_game_gui()  # Runs Main Game function if x-ed out
-
-def start_k2_game(): #k-2 level
+def start_k2_game(stack): #k-2 level
+    from game import Game
     grid_width, grid_height = 6, 6  # Fixed grid size
     player_positions = [(0, 0), (grid_width - 1, grid_height - 1)]  # Opposite corners
     game = Game(grid_width, grid_height, player_positions, cell_size=40)
-    game.run()
+    stack.push(game)
 
-## Main Game GUI Function is the main function that needs to be launched for the game to begin. Users select level, or can click ##
+## Main Menu scene is the first screen of the game. Users select level, or can click ##
 ## About to see how the game works ##
-def main_game_gui():
-    game_creation_screen = pg.display.set_mode((325, 500))  # Screen inits
-    pg.display.set_caption("Main Menu | Wandering in the Woods")
-    background = pg.Surface((325, 500))
-    background.fill("whitesmoke")
-    game_creation_screen.blit(background, (0, 0))
-    display_text = x_large_font.render("Wandering", False, color="dimgrey")  # Text inits
-    game_creation_screen.blit(display_text, (75, 360))
-    display_text_2 = x_large_font.render("in the", False, color="dimgrey")
-    game_creation_screen.blit(display_text_2, (115, 400))
-    display_text_3 = x_large_font.render("Woods", False, color="dimgrey")
-    game_creation_screen.blit(display_text_3, (107, 440))
+class MenuScene(Scene):
+    size = (325, 500)
+    caption = "Main Menu | Wandering in the Woods"
+    wait_timeout = 0  # Idle menu sleeps until there is input instead of spinning
 
-    K_though_2_button = MenuButton(25, 300, 75, 50, "K Through 2")  # Button inits
-    K_though_2_button.draw(game_creation_screen)
+    def enter(self):
+        super().enter()  # Screen inits
+        game_creation_screen = self.screen
+        background = pg.Surface((325, 500))
+        background.fill("whitesmoke")
+        game_creation_screen.blit(background, (0, 0))
+        display_text = render_text("Wandering", x_large_font, "dimgrey", False)  # Text inits
+        game_creation_screen.blit(display_text, (75, 360))
+        display_text_2 = render_text("in the", x_large_font, "dimgrey", False)
+        game_creation_screen.blit(display_text_2, (115, 400))
+        display_text_3 = render_text("Woods", x_large_font, "dimgrey", False)
+        game_creation_screen.blit(display_text_3, (107, 440))
 
-    three_through_5_button = MenuButton(125, 300, 75, 50, "3 Through 5")
-    three_through_5_button.draw(game_creation_screen)
+        K_though_2_button = MenuButton(25, 300, 75, 50, "K Through 2")  # Button inits
+        K_though_2_button.draw(game_creation_screen)
 
-    six_through_8_button = MenuButton(225, 300, 75, 50, "6 Through 8")
-    six_through_8_button.draw(game_creation_screen)
+        three_through_5_button = MenuButton(125, 300, 75, 50, "3 Through 5")
+        three_through_5_button.draw(game_creation_screen)
 
-    about_button = MenuButton(250, 25, 50, 25, "About")
-    about_button.draw(game_creation_screen)
+        six_through_8_button = MenuButton(225, 300, 75, 50, "6 Through 8")
+        six_through_8_button.draw(game_creation_screen)
 
-    # RRFIX: Create picture for main menu
+        about_button = MenuButton(250, 25, 50, 25, "About")
+        about_button.draw(game_creation_screen)
 
-    play_audio_file("Welcome.mp3")
-    running = True
-    while running:
+        # RRFIX: Create picture for main menu
 
-        events = pg.event.get()
-        for event in events:
-            if event.type == pg.QUIT:
-                running = False
-                pg.quit()  # When the main menu is closed, pygame is quit and the program is terminated
-                sys.exit()
+        play_audio_file("Welcome.mp3")
 
-            if event.type == pg.MOUSEBUTTONDOWN:
-                mouse_pos = pg.mouse.get_pos()
+    def handle_event(self, event):
+        if event.type == pg.QUIT:
+            self.stack.quit()  # When the main menu is closed, the program is terminated
 
-                if (25 <= mouse_pos[0] <= 100) and (300 <= mouse_pos[1] <= 350):
-                    print("K through 2 Selected")
-                    start_k2_game()  # Run K-2 game directly
+        if event.type == pg.MOUSEBUTTONDOWN:
+            mouse_pos = event.pos
 
+            if (25 <= mouse_pos[0] <= 100) and (300 <= mouse_pos[1] <= 350):
+                logger.info("K through 2 Selected")
+                start_k2_game(self.stack)  # Run K-2 game directly
 
-                elif (125 <= mouse_pos[0] <= 200) and (300 <= mouse_pos[1] <= 350):
-                    print("3 through 5")  # Launches 3-5 selection screen
-                    selection_window()
 
-                elif (225 <= mouse_pos[0] <= 300) and (300 <= mouse_pos[1] <= 350):
-                    print("6 through 8")  # Launches 6-8 selection screen
-                    selection_window()
+            elif (125 <= mouse_pos[0] <= 200) and (300 <= mouse_pos[1] <= 350):
+                logger.info("3 through 5")  # Launches 3-5 selection screen
+                self.stack.push(SelectionScene())
 
-                elif (250 <= mouse_pos[0] <= 300) and (25 <= mouse_pos[1] <= 50):
-                    print("ABOUT")  # Launches about section
-                    about_window()
+            elif (225 <= mouse_pos[0] <= 300) and (300 <= mouse_pos[1] <= 350):
+                logger.info("6 through 8")  # Launches 6-8 selection screen
+                self.stack.push(SelectionScene())
 
-        pg.display.update()
-    return None
+            elif (250 <= mouse_pos[0] <= 300) and (25 <= mouse_pos[1] <= 50):
+                logger.info("ABOUT")  # Launches about section
+                self.stack.push(AboutScene())
 
 
-main_game_gui()
+## Main Game GUI Function is the main function that needs to be launched for the game to begin. ##
+## A single loop drives every screen through the scene stack, starting at the main menu ##
+def main_game_gui():
+    def first_frame():  # The menu is on screen: finish the startup report
+        startup.mark("first frame")
+        startup.report()
+
+    SceneStack().run(MenuScene(), on_first_frame=first_frame)
+    pg.quit()  # When the main menu is closed, pygame is quit and the program is terminated
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main_game_gui()
@@ -0,0 +1,241 @@
+### Exact meeting times from the Markov chain of the walk ###
+
+# Exact meeting times for small games, as a ground truth for the simulators.
+#
+# Example: python analysis.py 6 6 0,0 5,5
+
+import argparse
+import sys
+from functools import lru_cache
+from itertools import product
+from math import comb
+
+import numpy as np
+from scipy.sparse import csr_matrix, identity
+from scipy.sparse.linalg import bicgstab, spsolve
+
+from simulation import DIRECTIONS
+
+# A state is the set of cells the groups stand on: groups on the same cell have merged, so the order and
+# identity of players no longer matter. Every group moves one of four directions (staying put at walls)
+# and the game ends when one cell is left. Steps are only counted when some group moved, so the chain
+# below is the real walk conditioned on at least one group moving.
+# States that are mirror images / rotations of each other have the same future, so only one is kept.
+
+MAX_STATES = 50000  # beyond this building the chain takes too long, use the simulators instead
+
+
+def symmetries(grid_width, grid_height): # cell maps of the rectangle's symmetry group (8 for squares, else 4)
+    w, h = grid_width - 1, grid_height - 1
+    maps = [
+        lambda x, y: (x, y),
+        lambda x, y: (w - x, y),
+        lambda x, y: (x, h - y),
+        lambda x, y: (w - x, h - y),
+    ]
+    if grid_width == grid_height:
+        maps += [
+            lambda x, y: (y, x),
+            lambda x, y: (h - y, x),
+            lambda x, y: (y, w - x),
+            lambda x, y: (h - y, w - x),
+        ]
+    return maps
+
+
+def estimated_cost(grid_width, grid_height, players): # rough count of transitions to enumerate, before building
+    cells = grid_width * grid_height
+    images = len(symmetries(grid_width, grid_height))
+    return sum(comb(cells, groups) * len(DIRECTIONS) ** groups for groups in range(2, players + 1)) // images
+
+
+class MeetingChain:
+    def __init__(self, grid_width, grid_height, player_positions, max_states=MAX_STATES):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.max_states = max_states
+
+        # Cells are numbered y * width + x, and a state is its sorted cell numbers padded with the sentinel
+        # (one past the last cell) to one digit per player, packed into a single int64 in base cells + 1
+        cells = [(x, y) for y in range(grid_height) for x in range(grid_width)]
+        self.sentinel = len(cells)
+        self.base = len(cells) + 1
+        self.digits = len(player_positions)
+        if self.base ** self.digits >= 2 ** 63:
+            raise ValueError(f"{self.digits} players on a {grid_width}x{grid_height} grid is too large for the exact "
+                             "solver, use the simulators")
+        # Each symmetry and each direction becomes a lookup table over cell numbers (the sentinel maps to itself)
+        self._images = np.array([[f(x, y)[1] * grid_width + f(x, y)[0] for x, y in cells] + [self.sentinel]
+                                 for f in symmetries(grid_width, grid_height)])
+        self._moves = np.array([[self._move(x, y, dx, dy) for dx, dy in DIRECTIONS] for x, y in cells])
+
+        self.start = self.canonical(player_positions)
+        self.states = []  # codes of the transient states (more than one group), index = row in the matrices
+        self.index = {}
+        self._build()
+        self._expected = None
+
+    def _move(self, x, y, dx, dy): # cell number after a move, staying put at walls (same edge rule as Simulation.apply_moves)
+        new_x, new_y = x + dx, y + dy
+        if not (0 <= new_x < self.grid_width and 0 <= new_y < self.grid_height):
+            new_x, new_y = x, y
+        return new_y * self.grid_width + new_x
+
+    def canonical(self, positions): # state code of groups standing on these (x, y) cells
+        cells = np.array([[y * self.grid_width + x for x, y in positions]])
+        return int(self._canonical(cells)[0][0])
+
+    def cells(self, state): # (x, y) cells of a state code
+        digits = []
+        for _ in range(self.digits):
+            state, cell = divmod(state, self.base)
+            if cell != self.sentinel:
+                digits.append((cell % self.grid_width, cell // self.grid_width))
+        return digits[::-1]
+
+    def _canonical(self, cells): # codes and group counts for cell arrays (..., players), smallest symmetric image
+        best = groups = None
+        for image in self._images:
+            mapped = np.sort(image[cells], axis=-1)
+            repeated = np.zeros(mapped.shape, dtype=bool)
+            repeated[..., 1:] = mapped[..., 1:] == mapped[..., :-1]  # groups on the same cell merge
+            mapped = np.sort(np.where(repeated, self.sentinel, mapped), axis=-1)
+            codes = np.zeros(mapped.shape[:-1], dtype=np.int64)
+            for digit in range(self.digits):
+                codes = codes * self.base + (mapped[..., digit] if digit < mapped.shape[-1] else self.sentinel)
+            best = codes if best is None else np.minimum(best, codes)
+            groups = (mapped != self.sentinel).sum(axis=-1)
+        return best, groups
+
+    def _decode(self, codes, count): # cell numbers of the first count digits of each state code
+        digits = np.empty((len(codes), self.digits), dtype=np.int64)
+        for digit in range(self.digits - 1, -1, -1):
+            codes, digits[:, digit] = np.divmod(codes, self.base)
+        return digits[:, :count]
+
+    def _add_state(self, state, groups):
+        if len(self.states) >= self.max_states:
+            raise ValueError(f"more than {self.max_states} states for a {self.grid_width}x{self.grid_height} grid, "
+                             "use the simulators for configurations this large")
+        self.index[state] = len(self.states)
+        self.states.append(state)
+        self._groups.append(groups)
+
+    def _expand(self, rows, count, entries, absorb): # adds the transitions of states with count groups
+        combos = np.array(list(product(range(len(DIRECTIONS)), repeat=count)))  # every direction per group
+        cells = self._decode(np.array([self.states[row] for row in rows]), count)
+        destinations = self._moves[cells[:, None, :], combos[None, :, :]]  # (states, combos, groups)
+
+        stayed = (destinations == cells[:, None, :]).all(axis=-1)  # every group hit a wall: not a counted step
+        weights = np.where(stayed, 0.0, 1.0)
+        weights /= weights.sum(axis=1, keepdims=True)  # condition on some group moving
+        codes, groups = self._canonical(destinations)
+        sources = np.broadcast_to(np.arange(len(rows))[:, None], codes.shape)
+
+        met = groups == 1
+        np.add.at(absorb, np.asarray(rows)[sources[met]], weights[met])
+
+        keep = ~met & ~stayed
+        targets, column = np.unique(codes[keep], return_inverse=True)
+        target_groups = np.zeros(len(targets), dtype=np.int64)
+        target_groups[column] = groups[keep]
+        for code, target_count in zip(targets.tolist(), target_groups.tolist()):
+            if code not in self.index:
+                self._add_state(code, target_count)
+        columns = np.array([self.index[code] for code in targets.tolist()])
+
+        # Several direction combos can lead to the same state: sum them per (source, target) pair
+        pairs, inverse = np.unique(sources[keep] * len(targets) + column, return_inverse=True)
+        entries.append((np.asarray(rows)[pairs // len(targets)], columns[pairs % len(targets)],
+                        np.bincount(inverse, weights=weights[keep], minlength=len(pairs))))
+
+    def _build(self): # breadth-first over the states reachable from the start, one frontier at a time
+        entries = []  # (rows, columns, probabilities) arrays of the transient part
+        absorb = np.zeros(0)  # probability of meeting in the next step, per transient state
+        self._groups = []  # number of groups in each state
+        start_groups = len(self.cells(self.start))
+        if start_groups > 1:
+            self._add_state(self.start, start_groups)
+
+        done = 0
+        while done < len(self.states):
+            frontier = range(done, len(self.states))
+            done = len(self.states)
+            absorb = np.concatenate([absorb, np.zeros(done - len(absorb))])
+            by_groups = {}
+            for row in frontier:
+                by_groups.setdefault(self._groups[row], []).append(row)
+            for count, rows in by_groups.items():
+                chunk = max(1, 2 ** 18 // len(DIRECTIONS) ** count)  # bounds the (states, combos, groups) arrays
+                for i in range(0, len(rows), chunk):
+                    self._expand(rows[i:i + chunk], count, entries, absorb)
+
+        n = len(self.states)
+        rows, columns, values = (np.concatenate(parts) for parts in zip(*entries)) if entries else ([], [], [])
+        self.transient = csr_matrix((values, (rows, columns)), shape=(n, n))
+        self.absorb = absorb
+
+    def expected_steps(self, player_positions=None): # exact expected number of counted steps until everyone meets
+        state = self.start if player_positions is None else self.canonical(player_positions)
+        if len(self.cells(state)) == 1:
+            return 0.0
+        if self._expected is None:
+            n = len(self.states)
+            system = (identity(n, format="csr") - self.transient).tocsr()
+            # Krylov iterations converge in well under a second here; a direct solve suffers heavy fill-in
+            expected, info = bicgstab(system, np.ones(n), rtol=1e-12, atol=0.0, maxiter=100 * n)
+            if info != 0:
+                expected = spsolve(system.tocsc(), np.ones(n))
+            self._expected = np.atleast_1d(expected)
+        return float(self._expected[self.index[state]])
+
+    def distribution(self, max_steps=None, tolerance=1e-9): # P(meeting takes exactly n steps) for n = 0, 1, ...
+        if not self.states:
+            return [1.0]  # everyone started on one cell
+        step = self.transient.T.tocsr()
+        mass = np.zeros(len(self.states))
+        mass[self.index[self.start]] = 1.0
+        probabilities = [0.0]
+        while mass.sum() > tolerance and (max_steps is None or len(probabilities) <= max_steps):
+            probabilities.append(float(mass @ self.absorb))
+            mass = step @ mass
+        return probabilities
+
+    def percentile(self, percent, tolerance=1e-9): # smallest n with P(steps <= n) >= percent / 100
+        total = 0.0
+        for n, p in enumerate(self.distribution(tolerance=tolerance)):
+            total += p
+            if total >= percent / 100 - tolerance:
+                return n
+        return n
+
+
+@lru_cache(maxsize=64)
+def _cached_expected_steps(grid_width, grid_height, start, max_states):
+    return MeetingChain(grid_width, grid_height, start, max_states).expected_steps()
+
+
+def expected_meeting_steps(grid_width, grid_height, player_positions, max_states=MAX_STATES): # cached, for Play Again
+    start = tuple(sorted(set(map(tuple, player_positions))))
+    return _cached_expected_steps(grid_width, grid_height, start, max_states)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact meeting times of Wandering in the Woods.")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("positions", nargs="+", help="start cell of each player as x,y")
+    parser.add_argument("--max-states", type=int, default=MAX_STATES, help="give up beyond this many states")
+    args = parser.parse_args(argv)
+
+    positions = [tuple(int(part) for part in position.split(",")) for position in args.positions]
+    chain = MeetingChain(args.width, args.height, positions, args.max_states)
+    print(f"states:         {len(chain.states)}")
+    print(f"expected steps: {chain.expected_steps():.6g}")
+    for percent in (50, 95, 99):
+        print(f"p{percent}:            {chain.percentile(percent)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
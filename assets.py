@@ -0,0 +1,220 @@
+### One memory-mapped file holding the game's sounds and images ###
+
+# Opening many small files is slow on locked-down lab machines (every open goes through the virus scanner),
+# so the audio prompts and pictures can be shipped as a single pack. The pack is mapped into memory once and
+# each asset is served from the mapping; anything missing from it is still read from its loose file.
+#
+# Layout: MAGIC, version, entry count, then per entry (name length, name, offset, size), then the data.
+# Names are paths relative to the game directory with forward slashes, e.g. "AudioFiles/Welcome.mp3".
+#
+# Images go through image_cache: each one is decoded once, and the display-format, scaled and translucent
+# variants a screen asks for are kept per (size, alpha), so showing a picture again costs one blit. Images that
+# could not be found are remembered as well, so a missing file is looked for (and logged) only once.
+#
+# Example: python assets.py build dist/Main/_internal/AudioFiles dist/Main/fireworks.jpg
+#          python assets.py list
+
+import argparse
+import io
+import logging
+import mmap
+import os
+import struct
+import sys
+
+import pygame as pg
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"WWAP"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")  # magic, version, entries
+ENTRY = struct.Struct("<H")  # name length, followed by the UTF-8 name and LOCATION
+LOCATION = struct.Struct("<QQ")  # offset from the start of the pack, size
+GAME_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PACK_PATH = os.path.join(GAME_DIRECTORY, "assets.pack")
+ASSET_EXTENSIONS = (".mp3", ".ogg", ".wav", ".jpg", ".jpeg", ".png", ".bmp")
+# Where loose assets are looked for: next to the modules (the bundle's _internal folder when frozen), next to
+# the executable of a PyInstaller build (fireworks.jpg sits there), then the working directory as before
+SEARCH_DIRECTORIES = [GAME_DIRECTORY]
+if getattr(sys, "frozen", False):
+    SEARCH_DIRECTORIES.append(os.path.dirname(os.path.abspath(sys.executable)))
+SEARCH_DIRECTORIES.append(os.curdir)
+
+
+class AssetPack:
+    def __init__(self, path=PACK_PATH):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # stays valid after the close
+        magic, version, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a Wandering in the Woods asset pack (or a newer version)")
+        self.entries = {}  # name -> (offset, size)
+        offset = HEADER.size
+        for _ in range(count):
+            (length,) = ENTRY.unpack_from(self._map, offset)
+            offset += ENTRY.size
+            name = self._map[offset:offset + length].decode("utf-8")
+            offset += length
+            self.entries[name] = LOCATION.unpack_from(self._map, offset)
+            offset += LOCATION.size
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def read(self, name): # the asset's bytes (KeyError if it is not in the pack)
+        offset, size = self.entries[name]
+        return self._map[offset:offset + size]
+
+    def open(self, name): # file-like object for pygame loaders
+        return io.BytesIO(self.read(name))
+
+    def close(self):
+        self._map.close()
+
+
+_pack = None
+_pack_checked = False
+
+
+def get_asset_pack(): # the shared pack next to the game's modules, None if there is none
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        if os.path.exists(PACK_PATH):
+            _pack = AssetPack(PACK_PATH)
+    return _pack
+
+
+def asset_name(path): # pack name of a file given relative to the game directory
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def find_asset(name): # path of a loose asset file, None if it is in none of the SEARCH_DIRECTORIES
+    for directory in SEARCH_DIRECTORIES:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+class ImageCache:
+    def __init__(self):
+        self.images = {}  # name -> Surface as decoded, None for an image that could not be loaded
+        self.variants = {}  # (name, size, alpha) -> Surface ready to blit
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, name): # decoded image from the pack or a loose file, None (logged once) if there is none
+        if name in self.images:
+            return self.images[name]
+        image = None
+        pack = get_asset_pack()
+        try:
+            if pack and name in pack:
+                image = pg.image.load(pack.open(name), name)
+            else:
+                path = find_asset(name)
+                if path is None:
+                    logger.warning("Image %s not found (looked in %s)", name, ", ".join(SEARCH_DIRECTORIES))
+                else:
+                    image = pg.image.load(path)
+        except pg.error as e:
+            logger.warning("Error loading image %s: %s", name, e)
+        self.images[name] = image
+        return image
+
+    def get(self, name, size=None, alpha=None): # image scaled to size (w, h) with surface alpha, None if missing
+        key = (name, size, alpha)
+        if key in self.variants:
+            self.hits += 1
+            return self.variants[key]
+
+        self.misses += 1
+        image = self.load(name)
+        if image is not None:
+            if pg.display.get_surface() is not None:
+                image = image.convert_alpha()  # display format, so every blit is a straight copy
+            if size is not None and image.get_size() != tuple(size):
+                image = pg.transform.scale(image, size)
+            elif alpha is not None:
+                image = image.copy()  # the plain variant stays opaque
+            if alpha is not None:
+                image.set_alpha(alpha)
+        self.variants[key] = image
+        return image
+
+    def clear(self): # forgets every image and miss (e.g. after new files were put in place)
+        self.images.clear()
+        self.variants.clear()
+
+    def stats(self): # hit/miss counters and memory use
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": sum(image is not None for image in self.images.values()),
+            "missing": sum(image is None for image in self.images.values()),
+            "variants": len(self.variants),
+            "bytes": sum(image.get_width() * image.get_height() * image.get_bytesize()
+                         for image in self.variants.values() if image is not None),
+        }
+
+
+image_cache = ImageCache()  # process-wide, shared by every screen that shows a picture
+
+
+def get_image(name, size=None, alpha=None): # cached image variant, see ImageCache.get
+    return image_cache.get(name, size, alpha)
+
+
+def build(output, sources, base=None): # writes a pack of the given files and directories, returns the names
+    files = []  # (name, path)
+    for source in sources:
+        root = os.path.dirname(os.path.abspath(source)) if base is None else base
+        if os.path.isdir(source):
+            for directory, _, names in sorted(os.walk(source)):
+                for file_name in sorted(names):
+                    if file_name.lower().endswith(ASSET_EXTENSIONS):
+                        path = os.path.join(directory, file_name)
+                        files.append((asset_name(os.path.relpath(path, root)), path))
+        else:
+            files.append((asset_name(os.path.relpath(source, root)), source))
+
+    encoded = [(name.encode("utf-8"), path, os.path.getsize(path)) for name, path in files]
+    offset = HEADER.size + sum(ENTRY.size + len(name) + LOCATION.size for name, _, _ in encoded)
+    with open(output, "wb") as pack:
+        pack.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        for name, _, size in encoded:
+            pack.write(ENTRY.pack(len(name)) + name + LOCATION.pack(offset, size))
+            offset += size
+        for _, path, _ in encoded:
+            with open(path, "rb") as file:
+                pack.write(file.read())
+    return [name for name, _ in files]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the Wandering in the Woods asset pack.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_command = commands.add_parser("build", help="pack files and directories (names are relative to the "
+                                                      "directory each one is in)")
+    build_command.add_argument("sources", nargs="+")
+    build_command.add_argument("--output", default=PACK_PATH)
+    list_command = commands.add_parser("list", help="show what a pack holds")
+    list_command.add_argument("pack", nargs="?", default=PACK_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        names = build(args.output, args.sources)
+        print(f"{args.output}: {len(names)} assets, {os.path.getsize(args.output)} bytes")
+        return 0
+    pack = AssetPack(args.pack)
+    for name, (_, size) in sorted(pack.entries.items()):
+        print(f"{size:>10}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
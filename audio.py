@@ -0,0 +1,89 @@
+import logging
+import os
+import time
+
+import pygame as pg
+
+from assets import GAME_DIRECTORY, asset_name, get_asset_pack
+
+logger = logging.getLogger(__name__)
+
+# Audio prompts are decoded once into pygame.mixer.Sound objects and kept in memory,
+# so opening a screen plays its prompt without touching the disk or re-initializing the mixer.
+# Prompts come from the asset pack when there is one (see assets.py), otherwise from AudioFiles.
+
+AUDIO_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "AudioFiles")
+
+
+class AudioBank:
+    def __init__(self, directory=AUDIO_DIRECTORY):
+        self.directory = directory
+        self.sounds = {}  # file name -> decoded Sound
+        self.failed = set()  # files that could not be loaded, so we don't retry every screen change
+        self.load_times = {}  # file name -> seconds spent reading and decoding
+        self.mixer_init_time = None  # seconds spent in pg.mixer.init()
+        self.hits = 0
+        self.misses = 0
+        self.channel = None  # channel of the prompt currently playing
+
+    def init_mixer(self): # initializes the mixer once, returns False if there is no audio device
+        if pg.mixer.get_init():
+            return True
+        start = time.perf_counter()
+        try:
+            pg.mixer.init()
+        except pg.error as e:
+            logger.warning("Error initializing audio: %s", e)
+            return False
+        self.mixer_init_time = time.perf_counter() - start
+        return True
+
+    def load(self, file_name): # cached Sound for a file in the audio directory (None if it can't be loaded)
+        sound = self.sounds.get(file_name)
+        if sound is not None:
+            self.hits += 1
+            return sound
+        self.misses += 1
+        if file_name in self.failed or not self.init_mixer():
+            return None
+
+        start = time.perf_counter()
+        path = os.path.join(self.directory, file_name)
+        pack, name = get_asset_pack(), asset_name(os.path.relpath(path, GAME_DIRECTORY))
+        try:
+            sound = pg.mixer.Sound(file=pack.open(name)) if pack and name in pack else pg.mixer.Sound(path)
+        except (pg.error, FileNotFoundError) as e:
+            logger.warning("Error loading or playing the file: %s", e)
+            self.failed.add(file_name)
+            return None
+        self.load_times[file_name] = time.perf_counter() - start
+        self.sounds[file_name] = sound
+        return sound
+
+    def preload(self): # decodes every prompt up front
+        names = set(os.listdir(self.directory)) if os.path.isdir(self.directory) else set()
+        pack = get_asset_pack()
+        if pack:
+            prefix = asset_name(os.path.relpath(self.directory, GAME_DIRECTORY)) + "/"
+            names.update(name[len(prefix):] for name in pack.entries if name.startswith(prefix))
+        for file_name in sorted(names):
+            if file_name.lower().endswith((".mp3", ".ogg", ".wav")):
+                self.load(file_name)
+
+    def play(self, file_name): # plays a prompt once, stopping the previous one (does not block)
+        sound = self.load(file_name)
+        if self.channel is not None and self.channel.get_busy():
+            self.channel.stop()  # Stop any prompt that might already be playing
+        self.channel = sound.play() if sound is not None else None
+        return self.channel
+
+    def metrics(self): # load-time and cache counters
+        return {
+            "mixer_init_seconds": self.mixer_init_time,
+            "load_seconds": dict(self.load_times),
+            "total_load_seconds": sum(self.load_times.values()),
+            "cached": len(self.sounds),
+            "failed": sorted(self.failed),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,83 @@
+import numpy as np
+
+from simulation import DIRECTIONS
+
+# Vectorized engine for estimating meeting-time distributions: runs many independent games at once.
+# Same rules as simulation.Simulation: every group leader picks one of four directions, the group stays put
+# if that would leave the grid, a step only counts if some group moved, and groups on the same cell merge.
+
+MOVES = np.array(DIRECTIONS, dtype=np.int32)  # direction index -> (dx, dy)
+
+
+class BatchSimulation:
+    def __init__(self, grid_width, grid_height, player_positions, games, seed=None):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.games = games
+        self.player_count = len(player_positions)
+        self.rng = np.random.default_rng(seed)
+
+        self.steps = np.zeros(games, dtype=np.int64)  # finished step count per game
+        self.finished = np.zeros(games, dtype=bool)
+
+        # Only unfinished games are kept in these arrays; finished rows are dropped as they retire
+        start = np.array(player_positions, dtype=np.int32).reshape(1, self.player_count, 2)
+        self._positions = np.repeat(start, games, axis=0)  # (games, players, 2)
+        self._labels = np.repeat(np.arange(self.player_count)[None, :], games, axis=0)  # group id per player
+        self._ids = np.arange(games)  # which game each active row belongs to
+        self._player_index = np.arange(self.player_count)
+
+    @property
+    def active_games(self): # games still running
+        return len(self._ids)
+
+    def step(self):  # advances every active game by one movement cycle
+        if not len(self._ids):
+            return 0
+
+        positions, labels = self._positions, self._labels
+        directions = self.rng.integers(0, 4, size=labels.shape)  # one draw per player, only leaders' are used
+
+        # A group's leader is its lowest-numbered player (its label), members take the leader's direction
+        delta = MOVES[np.take_along_axis(directions, labels, axis=1)]
+        moved = positions + delta
+        inside = ((moved[..., 0] >= 0) & (moved[..., 0] < self.grid_width) &
+                  (moved[..., 1] >= 0) & (moved[..., 1] < self.grid_height))
+        positions = np.where(inside[..., None], moved, positions)  # stay put at the edges
+        self.steps[self._ids] += inside.any(axis=1)  # only count a step if some group moved
+
+        # Merge: every player joins the lowest-numbered player standing on the same cell
+        same_cell = (positions[:, :, None, :] == positions[:, None, :, :]).all(axis=3)
+        labels = np.where(same_cell, self._player_index, self.player_count).min(axis=2)
+
+        done = (labels == 0).all(axis=1)  # everyone is in player 1's group
+        if done.any():
+            self.finished[self._ids[done]] = True
+            keep = ~done
+            positions, labels, self._ids = positions[keep], labels[keep], self._ids[keep]
+
+        self._positions, self._labels = positions, labels
+        return len(self._ids)
+
+    def run(self, max_steps=None):  # runs until every game finishes, returns per-game step counts
+        ticks = 0
+        while self.active_games and (max_steps is None or ticks < max_steps):
+            self.step()
+            ticks += 1
+        return self.step_counts()
+
+    def step_counts(self): # step counts of finished games, as plain ints
+        return [int(steps) for steps in self.steps[self.finished]]
+
+    def record(self, stats):  # adds the finished games to a Stats object
+        for steps in self.step_counts():
+            stats.total_steps += steps
+            stats.record_step_run(steps)
+
+
+def simulate_batch(grid_width, grid_height, player_positions, games, seed=None, stats=None):  # many headless games
+    batch = BatchSimulation(grid_width, grid_height, player_positions, games, seed=seed)
+    batch.run()
+    if stats:
+        batch.record(stats)
+    return batch.step_counts()
@@ -0,0 +1,58 @@
+import random
+import sys
+import time
+
+from simulation import Population, Simulation
+
+# Compares the per-step cost of the old all-pairs check_collisions with the occupancy map + union-find one.
+# Run with: python -m benchmarks.collisions [grid size]
+
+
+def legacy_check_collisions(groups):  # the original O(G^2 * P^2) merge from Game.check_collisions
+    merged_groups = []
+    merged = set()
+    for i, group in enumerate(groups):
+        if i in merged:
+            continue
+        new_group = set(group)
+        for j, other_group in enumerate(groups):
+            if i != j and any(p1.x == p2.x and p1.y == p2.y for p1 in new_group for p2 in other_group):
+                new_group.update(other_group)
+                merged.add(j)
+        merged_groups.append(list(new_group))
+    return merged_groups
+
+
+def spread_players(count, grid_size, rng): # distinct random starting cells
+    cells = rng.sample(range(grid_size * grid_size), count)
+    return Population([(cell % grid_size, cell // grid_size) for cell in cells])
+
+
+def time_steps(player_count, grid_size, steps, legacy=False, seed=0): # seconds per collision check
+    rng = random.Random(seed)
+    sim = Simulation(grid_size, grid_size, spread_players(player_count, grid_size, rng), seed=seed)
+    groups = [[player] for player in sim.players]
+    elapsed = 0.0
+
+    for _ in range(steps):
+        sim.move_groups()
+        start = time.perf_counter()
+        if legacy:
+            groups = legacy_check_collisions(groups)
+        else:
+            sim.check_collisions()
+        elapsed += time.perf_counter() - start
+    return elapsed / steps
+
+
+def main(grid_size=200):
+    print(f"{'players':>8} {'legacy us/step':>15} {'indexed us/step':>16} {'indexed us/player':>18}")
+    for player_count in (2, 4, 8, 16, 32, 64, 128):
+        steps = 200
+        legacy = time_steps(player_count, grid_size, steps, legacy=True) if player_count <= 64 else float("nan")
+        indexed = time_steps(player_count, grid_size, steps)
+        print(f"{player_count:>8} {legacy * 1e6:>15.1f} {indexed * 1e6:>16.1f} {indexed * 1e6 / player_count:>18.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,157 @@
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Plays hundreds of menu -> selection -> placement -> game -> stats -> play again cycles through the scene stack
+# under the dummy SDL drivers and checks that memory and the scene stack stay flat.
+#
+# How memory is judged:
+# - The first WARMUP_CYCLES cycles are not measured. They create what lives as long as the process: fonts, the
+#   UI theme, failed audio lookups, cached images, lazily imported modules. Today two cycles are enough.
+#   Without a warm-up, the first window grows by about 13 MB.
+# - Before each reading, the run log is flushed and rendered text is dropped from the LRU cache. Both are
+#   bounded, but they would otherwise show as growth while they fill.
+# - The measured cycles are split into two windows of equal length. Each window may grow by at most
+#   TOLERANCE_PER_CYCLE bytes per cycle plus WINDOW_SLACK, which covers the run log's writer thread.
+#
+# Run with: python -m benchmarks.soak_scenes [cycles] [warm-up cycles]
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("WANDERING_LOG_LEVEL", "WARNING")
+
+import pygame as pg  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(tempfile.mkdtemp(prefix="wandering-soak-"))  # keep the run log out of the source tree
+
+import game  # noqa: E402
+
+game.GAME_OVER_DELAY = 0  # the soak is about memory, not about watching the screens
+game.K2_STATS_DELAY = 0
+
+import Main  # noqa: E402
+import pygame_gui as pgg  # noqa: E402
+from fonts import text_cache  # noqa: E402
+from runlog import get_run_log  # noqa: E402
+from scenes import SceneStack  # noqa: E402
+
+MAX_TICKS = 100000  # per screen, so a broken transition fails instead of hanging
+
+
+def click(pos):
+    pg.event.post(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+
+def run_until(stack, scene_type):  # ticks the stack until the given scene is on top
+    for _ in range(MAX_TICKS):
+        if isinstance(stack.top, scene_type):
+            return stack.top
+        stack.tick()
+    raise RuntimeError(f"never reached {scene_type.__name__}, stuck on {type(stack.top).__name__}")
+
+
+def play_from_placement(stack, placement):  # picks start cells, starts the game at max speed, returns the stats
+    for player in range(placement.number_of_players):
+        click((placement.grid_offset_x + 25 + 50 * player, placement.grid_offset_y + 25 + 50 * player))
+        stack.tick()
+    click((placement.start_button._x + 10, placement.start_button._y + 10))
+    run_until(stack, game.Game)
+    pg.event.post(pg.event.Event(pg.KEYDOWN, key=pg.K_4, mod=0, unicode="4", scancode=0))
+    return run_until(stack, game.StatsScene)
+
+
+def cycle(stack):  # one full trip through every screen, ending back on the main menu
+    click((150, 325))  # 3 through 5
+    selection = run_until(stack, Main.SelectionScene)
+    for box, text in ((selection.width_box, "7"), (selection.height_box, "5"), (selection.player_box, "3")):
+        pg.event.post(pg.event.Event(pgg.UI_SELECTION_LIST_NEW_SELECTION, ui_element=box, text=text))
+    stack.tick()
+    click((300, 200))  # Continue
+    placement = run_until(stack, Main.PlacementScene)
+
+    stats = play_from_placement(stack, placement)
+    click((stats.play_again_button.x + 10, stats.play_again_button.y + 10))
+    placement = run_until(stack, Main.PlacementScene)
+
+    stats = play_from_placement(stack, placement)
+    click((stats.main_menu_button.x + 10, stats.main_menu_button.y + 10))
+    run_until(stack, Main.MenuScene)
+
+    click((60, 325))  # K through 2, returns to the menu on its own
+    run_until(stack, game.Game)
+    pg.event.post(pg.event.Event(pg.KEYDOWN, key=pg.K_4, mod=0, unicode="4", scancode=0))
+    run_until(stack, game.StatsScene)
+    run_until(stack, Main.MenuScene)
+
+
+def frame_depth(): # Python frames below this one (inspect.stack() would fill linecache and skew the reading)
+    frame, depth = sys._getframe(1), 0
+    while frame is not None:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+
+def live_objects(kind):
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, kind))
+
+
+WARMUP_CYCLES = 10
+TOLERANCE_PER_CYCLE = 16  # bytes; a leaked Game or scene costs tens of kilobytes
+WINDOW_SLACK = 2048  # bytes per window for the writer thread's bookkeeping, measured at about +-500
+MEASURED_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+def traced_memory(): # bytes held once bounded buffers are empty
+    get_run_log().flush()
+    text_cache.clear(fonts=False)
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    return sum(trace.size for trace in snapshot.filter_traces(MEASURED_FILTERS).traces)
+
+
+def main(cycles=200, warmup=WARMUP_CYCLES):
+    stack = SceneStack(max_frame_rate=0)
+    stack.running = True
+    stack.push(Main.MenuScene())
+    stack.apply_transitions()
+
+    # Tracing starts before the warm-up: what the warm-up allocates is then in the baseline, and not counted again
+    # when a measured cycle reallocates it at the same size (the UI manager's sprite tables, for example)
+    tracemalloc.start()
+    for _ in range(warmup):
+        cycle(stack)
+
+    def report(i, reading):
+        print(f"{i:>7} {(reading - readings[0]) / 1024:>11.1f} {len(stack.scenes):>7} {live_objects(game.Game):>12} {frame_depth():>12}")
+
+    # The first snapshot compiles the filters' patterns and the first scan of gc.get_objects() imports pygame's
+    # lazily loaded modules, so both happen once before the baseline
+    readings = [traced_memory()]
+    print(f"{'cycle':>7} {'traced KiB':>11} {'scenes':>7} {'games alive':>12} {'frame depth':>12}")
+    report(0, readings[0])
+    readings = [traced_memory()]
+    window = max(1, cycles // 2)
+    for i in range(1, 2 * window + 1):
+        cycle(stack)
+        if i % window == 0 or i % max(1, window // 5) == 0:
+            reading = traced_memory()
+            if i % window == 0:
+                readings.append(reading)
+            report(i, reading)
+    tracemalloc.stop()
+
+    allowed = TOLERANCE_PER_CYCLE * window + WINDOW_SLACK
+    growths = [after - before for before, after in zip(readings, readings[1:])]
+    scenes_alive = live_objects(game.Game) + live_objects(Main.SelectionScene) + live_objects(Main.PlacementScene)
+    ok = all(growth <= allowed for growth in growths) and len(stack.scenes) == 1 and scenes_alive == 0
+    print(f"memory growth per window of {window} cycles: "
+          f"{', '.join(f'{growth / 1024:.1f} KiB' for growth in growths)} (allowed {allowed / 1024:.1f} KiB) -> "
+          f"{'OK' if ok else 'LEAK'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:3])))
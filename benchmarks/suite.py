@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Repeatable performance numbers for the parts of the game that change most: simulation throughput, the cost
+# of a collision check against the number of players, frame rendering against the grid size, Stats
+# bookkeeping and the cold start up to the first menu frame. Everything runs under the dummy SDL drivers.
+# Results are written as JSON; comparing against an earlier file flags metrics that got worse by more than
+# the threshold and exits with status 1, so the suite can gate a change.
+#
+# Run with: python -m benchmarks.suite --output after.json --compare before.json [--threshold 25] [--quick]
+#           python -m benchmarks.suite --compare before.json after.json   (compare two saved runs)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("WANDERING_LOG_LEVEL", "WARNING")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame as pg  # noqa: E402
+
+import game  # noqa: E402
+from benchmarks.collisions import spread_players  # noqa: E402
+from runlog import RunLog  # noqa: E402
+from scenes import SceneStack  # noqa: E402
+from simulation import Simulation  # noqa: E402
+from stats import Stats  # noqa: E402
+
+FORMAT = 1  # bump when metric names or units change meaning
+THRESHOLD = 25.0  # percent a metric may get worse before it counts as a regression (runs on one busy core
+                 # differ by 10-20%)
+PLAYER_COUNTS = (2, 4, 16, 64, 256, 1024)
+GRID_SIZES = (5, 10, 20, 50, 200, 1000)
+MIN_BATCH_TIME = 0.05  # seconds, long enough that timer resolution and scheduler hiccups average out
+
+STARTUP_SCRIPT = """
+import os, sys, time
+sys.path.insert(0, {root!r})
+os.chdir({workdir!r})
+import Main
+from scenes import SceneStack
+stack = SceneStack()
+stack.running = True
+stack.push(Main.MenuScene())
+stack.apply_transitions()
+stack.tick()
+print("ready", flush=True)
+"""
+
+
+def timed(function, repeats, min_time=MIN_BATCH_TIME): # best seconds per call over repeats batches
+    # Like timeit: batches grow until one takes min_time, and the fastest batch is the one least disturbed
+    # by the rest of the machine
+    function()  # warm up caches (fonts, cached grid lines, the direction buffer) outside the measurement
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+    return min(samples)
+
+
+def simulation_throughput(results, repeats): # steps per second of the headless rules and of the game's loop
+    def headless():
+        sim = Simulation.from_positions(20, 20, [(0, 0), (19, 19), (0, 19), (19, 0)], seed=1)
+        sim.run(max_steps=20000)
+        return sim.ticks
+
+    ticks = headless()
+    results["simulation.headless_steps_per_second"] = (ticks / timed(headless, repeats), "steps/s", "higher")
+
+    corners = [(0, 0), (19, 19), (0, 19), (19, 0)]
+    sim = new_game(20, corners).sim  # with the game's Stats and move recorder attached
+
+    def game_step():
+        if sim.finished:
+            sim.restore([(i, cell, [i]) for i, cell in enumerate(corners)], 0, 0)
+        sim.move_groups()
+        sim.check_collisions()
+
+    results["simulation.game_steps_per_second"] = (1 / timed(game_step, repeats), "steps/s", "higher")
+
+
+def collision_cost(results, repeats): # microseconds per step of moving and merging, against player count
+    for count in PLAYER_COUNTS:
+        sim = Simulation(400, 400, spread_players(count, 400, random.Random(count)), seed=count)
+        start = sim.snapshot()
+
+        def step():
+            if sim.ticks >= 200:  # keep measuring a well spread crowd rather than a few big groups
+                sim.restore(start, 0, 0)
+            sim.move_groups()
+            sim.check_collisions()
+
+        results[f"collisions.us_per_step.players_{count}"] = (timed(step, repeats) * 1e6, "us", "lower")
+
+
+def render_cost(results, repeats, sizes): # full redraw and per-frame (one step + incremental draw) milliseconds
+    for size in sizes:
+        corners = [(0, 0), (size - 1, size - 1), (0, size - 1), (size - 1, 0)]
+        game_instance = new_game(size, corners)
+        results[f"render.full_redraw_ms.{size}x{size}"] = (
+            timed(game_instance.draw_board, repeats) * 1000, "ms", "lower")
+
+        def frame():  # what Game.update and Game.draw do for one step, minus the game over screen
+            sim = game_instance.sim
+            game_instance.old_cells = set(sim.occupied)
+            game_instance.frame_start = time.perf_counter()
+            sim.move_groups()
+            sim.check_collisions()
+            if sim.finished:  # start over; the incremental draw repaints the cells everyone jumped from
+                sim.restore([(i, cell, [i]) for i, cell in enumerate(corners)], 0, 0)
+            game_instance.draw()
+
+        results[f"render.frame_ms.{size}x{size}"] = (timed(frame, repeats) * 1000, "ms", "lower")
+        close_game(game_instance)
+
+
+def stats_cost(results, repeats): # microseconds of Stats bookkeeping for one finished 100-step game
+    stats = Stats()
+
+    def one_game():
+        stats.start_timer()
+        for _ in range(100):
+            stats.increment_steps()
+        stats.stop_timer()
+        stats.record_step_run(100)
+
+    results["stats.us_per_game"] = (timed(one_game, repeats) * 1e6, "us", "lower")
+
+
+def startup_time(results, repeats): # milliseconds from launching Python to the first menu frame on screen
+    workdir = tempfile.mkdtemp(prefix="wandering-bench-")
+    script = STARTUP_SCRIPT.format(root=ROOT, workdir=workdir)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+        ready = any(line.strip() == "ready" for line in process.stdout)  # pygame may print its banner first
+        samples.append(time.perf_counter() - start)
+        process.communicate()
+        if not ready:
+            raise RuntimeError("the menu did not start")
+    results["startup.first_menu_frame_ms"] = (min(samples) * 1000, "ms", "lower")
+
+
+def new_game(size, positions): # a game on the scene stack, ready to step and draw
+    stack = SceneStack(max_frame_rate=0)
+    stack.running = True
+    game_instance = game.Game(size, size, positions, run_log=RunLog("bench_runs.db"), seed=1)
+    stack.push(game_instance)
+    stack.apply_transitions()
+    game_instance.draw_board()
+    return game_instance
+
+
+def close_game(game_instance):
+    game_instance.stack.quit()
+    game_instance.stack.apply_transitions()
+    game_instance.run_log.close()
+
+
+def run(quick=False): # every benchmark, as {"metrics": {name: {value, unit, better}}, ...}
+    repeats = 3 if quick else 5
+    results = {}
+    workdir = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="wandering-bench-"))  # games write stats files into the working directory
+    try:
+        simulation_throughput(results, repeats)
+        collision_cost(results, repeats)
+        render_cost(results, repeats, GRID_SIZES[:4] if quick else GRID_SIZES)
+        stats_cost(results, repeats)
+        startup_time(results, repeats)
+    finally:
+        os.chdir(workdir)
+    return {
+        "format": FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "metrics": {name: {"value": value, "unit": unit, "better": better}
+                    for name, (value, unit, better) in results.items()},
+    }
+
+
+def compare(baseline, current, threshold=THRESHOLD): # (lines to print, names of regressed metrics)
+    if baseline.get("format") != current.get("format"):
+        raise ValueError("the two result files come from different benchmark formats")
+    lines, regressions = [], []
+    for name, metric in current["metrics"].items():
+        before = baseline["metrics"].get(name)
+        if before is None or not before["value"]:
+            lines.append(f"{name:<45} {metric['value']:>12.4g} {metric['unit']:<8} (new)")
+            continue
+        change = (metric["value"] - before["value"]) / before["value"] * 100
+        worse = change if metric["better"] == "lower" else -change
+        flag = ""
+        if worse > threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif worse < -threshold:
+            flag = "improved"
+        lines.append(f"{name:<45} {before['value']:>12.4g} -> {metric['value']:<12.4g} {metric['unit']:<8} "
+                     f"{change:>+7.1f}% {flag}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Wandering in the Woods and compare against a baseline.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", nargs="+", metavar="FILE",
+                        help="baseline results to compare this run against, or a baseline and a later result file")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"percent a metric may get worse before it is a regression (default {THRESHOLD})")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and grid sizes")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and at most one result file")
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as file:
+            current = json.load(file)
+    else:
+        current = run(args.quick)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(current, file, indent=2)
+
+    if not args.compare:
+        for name, metric in current["metrics"].items():
+            print(f"{name:<45} {metric['value']:>12.4g} {metric['unit']}")
+        return 0
+
+    with open(args.compare[0]) as file:
+        baseline = json.load(file)
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} metric(s) got worse by more than {args.threshold:g}%")
+        return 1
+    print(f"no regressions beyond {args.threshold:g}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import pygame as pg
+
+# Which part of a (possibly huge) grid is on screen. Everything is in pixels: cell (x, y) covers
+# x * cell_size .. (x + 1) * cell_size in "world" pixels, and the camera's (x, y) is the world pixel shown
+# at the top left of the view. Drawing code asks the camera for the visible cells only, so the cost of a
+# frame depends on the window, not on the grid.
+
+MIN_CELL_SIZE = 1  # fully zoomed out: one pixel per cell
+MAX_CELL_SIZE = 80
+
+
+class Camera:
+    def __init__(self, view, cols, rows, cell_size=40):
+        self.view = pg.Rect(view)  # screen area the grid is drawn in
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.x = 0
+        self.y = 0
+        self.clamp()
+
+    @property
+    def fits(self): # the whole grid is on screen
+        return self.cols * self.cell_size <= self.view.width and self.rows * self.cell_size <= self.view.height
+
+    def clamp(self): # keeps the view on the grid, and centres the grid when it is smaller than the view
+        for axis, cells, size in (("x", self.cols, self.view.width), ("y", self.rows, self.view.height)):
+            world = cells * self.cell_size
+            if world <= size:
+                setattr(self, axis, -((size - world) // 2))
+            else:
+                setattr(self, axis, max(0, min(getattr(self, axis), world - size)))
+
+    def pan(self, dx, dy): # scrolls by screen pixels, returns True if the view moved
+        before = (self.x, self.y)
+        self.x += round(dx)
+        self.y += round(dy)
+        self.clamp()
+        return (self.x, self.y) != before
+
+    def zoom(self, factor, anchor=None): # scales the cells, keeping the grid point under anchor (screen) in place
+        cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, round(self.cell_size * factor)))
+        if cell_size == self.cell_size and factor != 1:
+            cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, self.cell_size + (1 if factor > 1 else -1)))
+        if cell_size == self.cell_size:
+            return False
+        ax, ay = anchor if anchor is not None else self.view.center
+        world_x = (ax - self.view.x + self.x) / self.cell_size
+        world_y = (ay - self.view.y + self.y) / self.cell_size
+        self.cell_size = cell_size
+        self.x = round(world_x * cell_size - (ax - self.view.x))
+        self.y = round(world_y * cell_size - (ay - self.view.y))
+        self.clamp()
+        return True
+
+    def center_on(self, x, y): # puts the given (fractional) cell coordinates in the middle of the view
+        self.x = round(x * self.cell_size - self.view.width / 2)
+        self.y = round(y * self.cell_size - self.view.height / 2)
+        self.clamp()
+
+    def fit(self): # zooms out (or in) until the whole grid is visible
+        self.cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, self.view.width // self.cols,
+                                                self.view.height // self.rows))
+        self.clamp()
+
+    def visible_cells(self): # (first col, first row, last col + 1, last row + 1) of the cells on screen
+        size = self.cell_size
+        return (max(0, self.x // size), max(0, self.y // size),
+                min(self.cols, -(-(self.x + self.view.width) // size)),
+                min(self.rows, -(-(self.y + self.view.height) // size)))
+
+    def cell_rect(self, x, y): # screen rectangle of a cell (may stick out of the view)
+        size = self.cell_size
+        return pg.Rect(self.view.x + x * size - self.x, self.view.y + y * size - self.y, size, size)
+
+    def cell_at(self, sx, sy): # cell under a screen point, None if there is no cell there
+        if not self.view.collidepoint(sx, sy):
+            return None
+        x = (sx - self.view.x + self.x) // self.cell_size
+        y = (sy - self.view.y + self.y) // self.cell_size
+        return (x, y) if 0 <= x < self.cols and 0 <= y < self.rows else None
+
+    def grid_rect(self): # part of the view covered by cells
+        size = self.cell_size
+        world = pg.Rect(self.view.x - self.x, self.view.y - self.y, self.cols * size, self.rows * size)
+        return world.clip(self.view)
+
+
+class Minimap:  # downsampled overview of the whole grid with the camera's view outlined
+    def __init__(self, rect, cols, rows, background=(30, 30, 30)):
+        scale = min(rect.width / cols, rect.height / rows)
+        self.rect = pg.Rect(rect.right - round(cols * scale), rect.y, round(cols * scale), round(rows * scale))
+        self.scale = scale  # minimap pixels per cell
+        self.background = background
+
+    def draw(self, screen, camera, leaders): # one dot per group (its leader, a player view), returns the rect to update
+        screen.fill(self.background, self.rect)
+        dot = max(1, round(self.scale))
+        for leader in leaders:
+            screen.fill(leader.color if hasattr(leader, "color") else (255, 255, 255),
+                        (self.rect.x + int(leader.x * self.scale), self.rect.y + int(leader.y * self.scale), dot, dot))
+
+        x0, y0, x1, y1 = camera.visible_cells()
+        view = pg.Rect(self.rect.x + int(x0 * self.scale), self.rect.y + int(y0 * self.scale),
+                       max(2, round((x1 - x0) * self.scale)), max(2, round((y1 - y0) * self.scale)))
+        pg.draw.rect(screen, (255, 255, 255), view.clip(self.rect), 1)
+        pg.draw.rect(screen, (120, 120, 120), self.rect, 1)
+        return self.rect
+
+    def cell_at(self, pos): # grid cell (fractional) under a point on the minimap, None outside it
+        if not self.rect.collidepoint(pos):
+            return None
+        return (pos[0] - self.rect.x) / self.scale, (pos[1] - self.rect.y) / self.scale
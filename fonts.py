@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+# Shared font registry and rendered-text cache used by every screen.
+# Fonts are looked up once per (face, size); rendered strings are kept in a bounded LRU cache.
+# A font is referred to by its (face, size) key, e.g. render_text("Start", ("Arial", 15), "white").
+
+
+class TextCache:
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # cap on the pixel memory held by cached surfaces
+        self.fonts = {}  # (face, size) -> pg.font.Font
+        self.surfaces = OrderedDict()  # (text, font, color, antialias) -> Surface, oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.font_hits = 0
+        self.font_misses = 0
+
+    def font(self, font_key): # SysFont for (face, size), looked up only once
+        font = self.fonts.get(font_key)
+        if font is None:
+            self.font_misses += 1
+            if not pg.font.get_init():
+                pg.font.init()
+            face, size = font_key
+            font = self.fonts[font_key] = pg.font.SysFont(face, size)
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, text, font_key, color, antialias=True): # cached font.render()
+        key = (text, font_key, color, bool(antialias))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(font_key).render(text, bool(antialias), color)
+        self.surfaces[key] = surface
+        self.bytes += self._size(surface)
+        while self.surfaces and (len(self.surfaces) > self.max_entries or self.bytes > self.max_bytes):
+            _, evicted = self.surfaces.popitem(last=False)  # drop the least recently used text
+            self.bytes -= self._size(evicted)
+        return surface
+
+    def clear(self, fonts=True): # forgets rendered surfaces, and fonts too unless fonts=False (after pg.quit())
+        if fonts:
+            self.fonts.clear()
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self): # hit/miss counters and memory use
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.surfaces),
+            "bytes": self.bytes,
+            "fonts": len(self.fonts),
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+        }
+
+    @staticmethod
+    def _size(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+text_cache = TextCache()  # process-wide cache shared by Button, MenuButton and the stats screens
+
+
+def get_font(face, size): # shared pg.font.Font for a face and size
+    return text_cache.font((face, size))
+
+
+def render_text(text, font, color, antialias=True): # cached rendering of text in a (face, size) font
+    return text_cache.render(text, font, color, antialias)
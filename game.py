@@ -1,11 +1,50 @@
+import argparse
+import logging
 import pygame
+import random
 import sys
+import time
 
 
+from assets import get_image
+from camera import Camera, Minimap
+from fonts import render_text
 from grid import Grid
-from player import Player
+from hud import PerformanceHud
+from instrumentation import Instrumentation
+from player import Players
+from replay import MoveRecorder, can_record
+from runlog import MAX_SEED, get_run_log
+from scenes import Scene, SceneStack
+from simulation import Simulation
 from stats import Stats
 
+logger = logging.getLogger(__name__)
+
+SIM_STEP = 0.1  # seconds of game time per movement cycle at 1x (the old clock.tick(10))
+FRAME_RATE = 30  # frames drawn per second, independent of the simulation speed
+MAX_STEPS_PER_FRAME = 1000  # cap on catch-up steps so a slow frame can't snowball
+
+GAME_OVER_DELAY = 4000  # ms the game over screen is shown
+K2_STATS_DELAY = 5000  # ms the K-2 stats screen is shown before returning to the main menu
+
+STATS_TOP = 105  # y of the first stats row under the total steps
+STATS_ROW_SPACING = 30  # px between stats rows where the window is tall enough
+EXPECTED_STEPS_BUDGET = 500000  # largest analysis.estimated_cost worth solving exactly for the stats screen
+
+# Timer events that replace the old blocking delays, so the window keeps handling input while it waits
+SHOW_STATS = pygame.event.custom_type()
+RETURN_TO_MENU = pygame.event.custom_type()
+
+# Number keys pick the simulation speed; None runs the game to completion as fast as possible
+SPEEDS = {pygame.K_1: 1, pygame.K_2: 10, pygame.K_3: 100, pygame.K_4: None}
+SEEK_FRACTION = 0.05  # left / right arrows jump this share of a replay's steps
+
+MAX_VIEW_SIZE = (800, 800)  # largest play area; bigger grids scroll and zoom inside it
+MINIMAP_SIZE = 150  # overview in the top right corner when the grid does not fit
+ZOOM_STEP = 1.25
+PAN_KEYS = {pygame.K_a: (-1, 0), pygame.K_d: (1, 0), pygame.K_w: (0, -1), pygame.K_s: (0, 1)}  # quarter view each
+
 
 class Button:
     def __init__(self, x, y, w, h, text):
@@ -14,14 +53,14 @@ class Button:
         self.w = w
         self.h = h
         self.text = text
-        self.font = pygame.font.SysFont("Arial", 20)
+        self.font = ("Arial", 20)  # (face, size) key into the shared font cache
 
     def draw(self, screen):
 
         button_rect = pygame.Rect(self.x, self.y, self.w, self.h)
         pygame.draw.rect(screen, "dimgrey", button_rect, border_radius=5)
 
-        text_surface = self.font.render(self.text, True, "white")
+        text_surface = render_text(self.text, self.font, "white")
         text_rect = text_surface.get_rect(center=button_rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -30,8 +69,7 @@ class Button:
         button_rect = pygame.Rect(self.x, self.y, self.w, self.h)
         pygame.draw.rect(screen, "dimgrey", button_rect, border_radius=5)
 
-        large_font = pygame.font.SysFont("Arial", 15)  # Bigger font for emphasis
-        text_surface = large_font.render(self.text, True, "white")
+        text_surface = render_text(self.text, ("Arial", 15), "white")  # Bigger font for emphasis
         text_rect = text_surface.get_rect(center=button_rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -39,113 +77,340 @@ class Button:
 
         return self.x <= mouse_pos[0] <= self.x + self.w and self.y <= mouse_pos[1] <= self.y + self.h
 
-class Game:
-    def __init__(self, grid_width, grid_height, player_positions, stats=None, cell_size=40, selection_func=None):
-        pygame.init()
+class Game(Scene):  # pygame front-end on top of simulation.Simulation, shown as a scene on the SceneStack
+    frame_rate = FRAME_RATE
+    caption = "Wandering in the Woods"
+
+    def __init__(self, grid_width, grid_height, player_positions, stats=None, cell_size=40,
+                 seed=None, speed=1, run_log=None, instrumentation=None, replay=None):
+        super().__init__()
+        if not pygame.display.get_init():
+            pygame.display.init()  # only what the game draws with, see Main.py
         self.grid = Grid(grid_width, grid_height, cell_size)
         self.stats = stats if stats else Stats()# Initialize stats tracking
-        print(f"Using Stats object at memory address: {id(self.stats)}")  # Debugging
+        logger.debug("Using Stats object at memory address: %s", id(self.stats))
         self.stats.start_timer()  # Start the timer when the game begins
-        window_width = grid_width * cell_size
-        window_height = grid_height * cell_size
-        self.selection_func = selection_func
-        self.screen = pygame.display.set_mode((window_width, window_height + 100))  # Extra space for stats
-        pygame.display.set_caption("Wandering in the Woods")
-
-        colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
-        self.players = [Player(i + 1, x, y, (grid_width, grid_height), colors[i], self.stats, cell_size)
-                        for i, (x, y) in enumerate(player_positions)]
-
-        self.groups = [[player] for player in self.players]
-
-        self.font = pygame.font.SysFont("Arial", 16)  # Font for step counter
-
-
+        window_width = min(grid_width * cell_size, MAX_VIEW_SIZE[0])
+        window_height = min(grid_height * cell_size, MAX_VIEW_SIZE[1])
+        self.size = (window_width, window_height + 100)  # Extra space for stats
+
+        # Only the cells inside the camera's view are drawn, so huge grids cost the same per frame as small ones
+        self.camera = Camera((0, 0, window_width, window_height), grid_width, grid_height, cell_size)
+        self.camera.center_on(player_positions[0][0] + 0.5, player_positions[0][1] + 0.5)
+        self.minimap = Minimap(pygame.Rect(window_width - MINIMAP_SIZE - 10, 10, MINIMAP_SIZE, MINIMAP_SIZE),
+                               grid_width, grid_height)
+        self.dragging = False
+
+        self.players = Players(player_positions)  # positions and colors as flat arrays, shared with the simulation
+        self.start_positions = list(player_positions)
+
+        # The rules (moving, merging, step counting) live in the headless simulation
+        self.playback = None  # replay.Playback when showing a recorded game instead of a new one
+        if replay is None:
+            self.sim = Simulation(grid_width, grid_height, self.players, self.stats, seed=seed)
+            self.recorder = None  # games that do not fit the recording format are logged without one
+            if can_record(self.sim):
+                self.recorder = MoveRecorder(self.sim)  # saved with the run so the game can be replayed
+        else:
+            self.sim = replay.simulation(self.players)  # no stats: a replay is not a new run
+            self.playback = replay.playback(self.sim)
+
+        self.font = ("Arial", 16)  # Font for step counter, see fonts.render_text
+        self.background = (50, 50, 50)  # Background color during game
+        self.speed = speed  # simulation speed multiplier, None = run to completion
+        self.accumulator = 0.0  # game time owed to the simulation
+        self.run_log = run_log if run_log else get_run_log()  # every finished game is appended here
+        # Per-phase frame timings, off unless WANDERING_INSTRUMENT is set
+        self.instrumentation = instrumentation if instrumentation else Instrumentation.from_environment()
+
+        # Performance overlay in the extra strip under the grid, toggled with H
+        self.hud = PerformanceHud(pygame.Rect(0, window_height, window_width, 100))
+        self.show_hud = False
+
+        self.full_redraw = False
+        self.old_cells = set()  # cells occupied before this frame's steps, repainted by draw()
+        self.steps_before = 0
+        self.frame_start = None  # when this frame's simulation started, for the HUD's sim/render split
+
+    @classmethod
+    def from_replay(cls, replay, cell_size=40, speed=1): # shows a replay.Replay, seekable with the arrow keys
+        return cls(replay.grid_width, replay.grid_height, replay.positions, cell_size=cell_size, speed=speed,
+                   replay=replay)
+
+    @property
+    def groups(self): # current groups of players, owned by the simulation
+        return self.sim.groups
+
+    def enter(self):
+        super().enter()
+        if self.speed != 1 or self.playback:
+            self.set_speed(self.speed)
+        self.draw_board()
 
     def game_over(self): # displays game over text
 
         self.screen.fill((255, 255, 255))  # White background
-        self.grid.draw(self.screen)  # Draw grid
+        self.grid.draw(self.screen, (255, 255, 255), self.camera)  # Draw grid
 
         # show players in their final positions
-        for player in self.players:
-            pygame.draw.circle(
-                self.screen,
-                player.color,
-                (player.x * self.grid.cell_size + self.grid.cell_size // 2,
-                 player.y * self.grid.cell_size + self.grid.cell_size // 2),
-                self.grid.cell_size // 2 - 5
-            )
+        self.draw_players()
 
         # Define bottom area for text display
         text_offset_y = self.screen.get_height() - 80  # Adjusts text position near bottom
 
         # Show "Game Over" message near bottom
-        game_over_text = self.font.render("Game Over!", True, (0, 0, 0))
+        game_over_text = render_text("Game Over!", self.font, (0, 0, 0))
         self.screen.blit(game_over_text, (self.screen.get_width() // 2 - 80, text_offset_y))
 
         if len(self.players) == 2 and self.grid.cols == 6 and self.grid.rows == 6:
-            try:
-                happy_image = pygame.image.load("fireworks.jpg").convert_alpha()  # Load image
-                happy_image = pygame.transform.scale(happy_image, (300, 300))  # Resize if needed
-                happy_image.set_alpha(50)
+            happy_image = get_image("fireworks.jpg", (300, 300), alpha=50)  # Decoded and scaled once per run
+            if happy_image is not None:
                 self.screen.blit(happy_image, (self.screen.get_width() // 2 - 150, 50))  # Center image
-            except pygame.error as e:
-                print("Error loading image:", e)
 
 
         pygame.display.flip()
-        pygame.time.delay(4000)  # Show for 4 seconds
-        self.display_full_stats()  # Transition to full stats screen
-
-    def check_collisions(self): # check if player have met
+        self.wait_timeout = 0  # nothing moves any more, sleep until the stats timer fires
+        if self.playback is None:  # a replay stays here so it can be rewound
+            self.start_timer(SHOW_STATS, GAME_OVER_DELAY)  # Show for 4 seconds, then the full stats screen
 
-        merged_groups = []
-        merged = set()
+    def record_run(self): # queues this game for the run log (written in the background) and exports timings
+        self.run_log.record(self.grid.cols, self.grid.rows, len(self.players), self.sim.seed, self.sim.steps,
+                            self.stats.last_run_time, self.sim.meetings,
+                            self.recorder.to_bytes() if self.recorder else None)
+        self.instrumentation.export()
 
-        # Loop through each group to check for collisions
-        for i, group in enumerate(self.groups):
-            if i in merged:
-                continue  # Skip groups that have already merged
-
-            new_group = set(group)  # Start with the current group
-
-            for j, other_group in enumerate(self.groups):
-                if i != j and any(p1.x == p2.x and p1.y == p2.y for p1 in new_group for p2 in other_group):
-                    new_group.update(other_group)  # Merge the two groups
-                    merged.add(j)  # Mark this group as merged
-
-            # Add the new merged group to the list
-            merged_groups.append(list(new_group))
+    def check_collisions(self): # check if player have met
 
-        self.groups = merged_groups  # Update groups
+        self.sim.check_collisions()  # Merge groups standing on the same cell
 
         # k-2 ends when the players meet
-        if len(self.players) == 2 and len(self.groups) == 1:
-            print("Players met!")
-            if len(self.players) == 2 and len(self.groups) == 1:
-                print("K-2: Players met!")
-
-                self.stats.stop_timer()  # Stop the timer when the game ends
-                self.stats.save_stats()  # Save stats
+        if len(self.players) == 2 and len(self.sim.members) == 1:
+            logger.info("Players met!")
+            if len(self.players) == 2 and len(self.sim.members) == 1:
+                logger.info("K-2: Players met!")
+
+                if self.playback is None:  # a replay is not a new run
+                    self.stats.stop_timer()  # Stop the timer when the game ends
+                    self.record_run()  # Save stats
                 self.game_over()
                 return
 
 
         #  3-5 and 6-8: continue until all players are together
-        elif len(self.groups) == 1 and len(self.groups[0]) == len(self.players):
-            print("All players have found each other!")
+        elif len(self.sim.members) == 1:
+            logger.info("All players have found each other!")
+
+            if self.playback is None:
+                self.stats.stop_timer()  # Stop the timer when the game ends
+                self.record_run()  # Save stats before showing
+            self.game_over()
+
+
 
-            self.stats.stop_timer()  # Stop the timer when the game ends
-            self.stats.save_stats()  # Save stats before showing
+    def expected_steps(self): # exact expected steps for this start, None if scipy is missing or the chain is too big
+        try:
+            import analysis  # optional: needs scipy, which the packaged game may not ship
+        except ImportError:
+            return None
+        cols, rows = self.grid.cols, self.grid.rows
+        if analysis.estimated_cost(cols, rows, len(self.players)) > EXPECTED_STEPS_BUDGET:
+            return None
+        return analysis.expected_meeting_steps(cols, rows, self.start_positions)
+
+    def display_full_stats(self): # replaces the game with the stats screen
+        k2_mode = len(self.players) == 2 and self.grid.cols == 6 and self.grid.rows == 6
+        self.stack.replace(StatsScene(self.stats, self.size, k2_mode, self.expected_steps(), self.sim.steps,
+                                      self.run_log, (self.grid.cols, self.grid.rows, len(self.players))))
+
+    def draw_players(self, cells=None): # draws the players on screen, or only those standing in the given cells
+        camera = self.camera
+        radius = max(1, camera.cell_size // 2 - min(5, camera.cell_size // 8))
+        players = self.players
+        xs, ys, colors, palette = players.xs, players.ys, players.colors, players.palette
+        x0, y0, x1, y1 = camera.visible_cells()
+        self.screen.set_clip(camera.view)  # players half out of view must not spill into the strip below
+        for root, members in self.sim.members.items():
+            top = members[-1]  # a group shares its leader's cell, so only its last player would show anyway
+            x, y = xs[root], ys[root]
+            if x0 <= x < x1 and y0 <= y < y1 and (cells is None or (x, y) in cells):
+                pygame.draw.circle(self.screen, palette[colors[top]], camera.cell_rect(x, y).center, radius)
+        self.screen.set_clip(None)
+
+    def draw_board(self): # full redraw of the play area
+        with self.instrumentation.phase("grid_draw"):
+            self.screen.fill(self.background)  # Background color during game
+            self.grid.draw(self.screen, self.background, self.camera)  # Only the visible part of the grid
+        with self.instrumentation.phase("player_draw"):
+            self.draw_players()
+
+    def move_camera(self, moved): # repaints everything after the view scrolled or zoomed
+        if moved and not self.sim.finished:
+            self.full_redraw = True
+
+    def set_speed(self, speed): # changes the simulation speed, shown in the window title
+        self.speed = speed
+        label = "max speed" if speed is None else f"{speed}x"
+        if self.playback:
+            label = f"replay, {label}"
+        pygame.display.set_caption(f"Wandering in the Woods ({label})")
+
+    def seek(self, step): # replay only: jumps to a step without playing the game up to it
+        self.playback.seek(step)
+        self.accumulator = 0.0
+        if self.sim.finished:
             self.game_over()
+        else:
+            self.wait_timeout = None  # the game over screen may have been up
+            self.full_redraw = True
+
+    def toggle_hud(self): # shows or hides the performance overlay
+        self.show_hud = not self.show_hud
+        self.hud.invalidate()
+        if not self.show_hud:
+            self.screen.fill(self.background, self.hud.rect)
+            pygame.display.update(self.hud.rect)
+
+    def step(self): # one movement cycle followed by the meeting check
+        timer = self.instrumentation.phase
+
+        # Move each group together (steps are only counted if a leader moved)
+        with timer("move"):
+            if self.playback:
+                self.playback.advance()
+            else:
+                self.sim.move_groups()
+        self.instrumentation.count("steps")
+
+        with timer("collisions"):
+            self.check_collisions()  # Check if players have met
 
-            self.display_full_stats()
+    def handle_event(self, event):
+        with self.instrumentation.phase("events"):
+            if event.type == pygame.QUIT:
+                self.stack.quit()  # closing the game window closes the program
+            elif event.type == pygame.KEYDOWN and event.key in SPEEDS:
+                self.set_speed(SPEEDS[event.key])
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_h and not self.sim.finished:
+                self.toggle_hud()
+            elif event.type == pygame.KEYDOWN and self.playback and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                jump = max(1, round(self.playback.replay.steps * SEEK_FRACTION))
+                self.seek(self.sim.steps + (jump if event.key == pygame.K_RIGHT else -jump))
+            elif event.type == pygame.KEYDOWN and self.playback and event.key in (pygame.K_HOME, pygame.K_END):
+                self.seek(0 if event.key == pygame.K_HOME else self.playback.replay.steps)
+            elif event.type == pygame.KEYDOWN and event.key in PAN_KEYS:
+                dx, dy = PAN_KEYS[event.key]
+                self.move_camera(self.camera.pan(dx * self.camera.view.width / 4, dy * self.camera.view.height / 4))
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.move_camera(self.camera.zoom(ZOOM_STEP))
+            elif event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.move_camera(self.camera.zoom(1 / ZOOM_STEP))
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                self.camera.fit()
+                self.move_camera(True)
+            elif event.type == pygame.MOUSEWHEEL:
+                self.move_camera(self.camera.zoom(ZOOM_STEP ** event.y, pygame.mouse.get_pos()))
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                cell = self.minimap.cell_at(event.pos) if not self.camera.fits else None
+                if cell is not None:
+                    self.camera.center_on(*cell)  # jump to the clicked part of the overview
+                    self.move_camera(True)
+                else:
+                    self.dragging = self.camera.view.collidepoint(event.pos)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.dragging = False
+            elif event.type == pygame.MOUSEMOTION and self.dragging:
+                self.move_camera(self.camera.pan(-event.rel[0], -event.rel[1]))
+            elif event.type == SHOW_STATS:
+                self.display_full_stats()  # Transition to full stats screen
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED) and not self.sim.finished:
+                self.full_redraw = True  # the window contents were lost, repaint everything
+
+    def update(self, dt):
+        if self.sim.finished:
+            return  # the game over screen is up
+        self.old_cells = set(self.sim.occupied)
+        self.steps_before = self.sim.ticks
+        self.frame_start = time.perf_counter()
+
+        # Fixed timestep: run as many whole steps as the elapsed time allows, then draw only the latest state
+        if self.speed is None:
+            deadline = time.perf_counter() + 1 / FRAME_RATE  # keep the window responsive
+            while not self.sim.finished and time.perf_counter() < deadline:
+                self.step()
+        else:
+            self.accumulator = min(self.accumulator + dt * self.speed, SIM_STEP * MAX_STEPS_PER_FRAME)
+            while self.accumulator >= SIM_STEP and not self.sim.finished:
+                self.step()
+                self.accumulator -= SIM_STEP
+
+        logger.debug("Total Steps: %d", self.stats.get_total_steps())
+
+    def draw(self):
+        timer = self.instrumentation.phase
+        render_start = time.perf_counter()
+
+        if self.sim.finished:  # game_over() already drew the final screen
+            self.frame_start = None
+            return None
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.draw_board()
+            self.hud.invalidate()
+            dirty_rects = True
+        else:
+            # Only the visible cells players left or entered need repainting
+            x0, y0, x1, y1 = self.camera.visible_cells()
+            dirty_cells = {(x, y) for x, y in self.old_cells.union(self.sim.occupied) if x0 <= x < x1 and y0 <= y < y1}
+            with timer("grid_draw"):
+                dirty_rects = self.grid.draw_cells(self.screen, dirty_cells, self.background, self.camera)
+            with timer("player_draw"):
+                self.draw_players(dirty_cells)
+            if self.show_hud:
+                hud_rect = self.hud.draw(self.screen, self.stack.clock, len(self.sim.members))
+                if hud_rect:
+                    dirty_rects.append(hud_rect)
+
+        if not self.camera.fits:  # the overview sits on top of the cells, so it is drawn last
+            minimap_rect = self.minimap.draw(self.screen, self.camera, self.sim.leaders)
+            if dirty_rects is not True:
+                dirty_rects.append(minimap_rect)
+
+        if self.show_hud:
+            self.hud.record_frame(render_start - self.frame_start, time.perf_counter() - render_start,
+                                  self.sim.ticks - self.steps_before)
+        self.frame_start = None
+        return dirty_rects  # the scene stack pushes these to the display and times it as "display"
+
+    def exit(self):
+        if not self.sim.finished:
+            self.instrumentation.export()  # finished games were already exported by record_run
+        super().exit()
+
+    def run(self): # plays this game on its own, without the menus
+        SceneStack().run(self)
+        pygame.quit()
+        sys.exit()
 
 
+class StatsScene(Scene):  # end of game statistics with Play Again / Main Menu
+    wait_timeout = 0  # static screen, only wakes up for input
 
-    def display_full_stats(self):
+    def __init__(self, stats, size, k2_mode, expected_steps=None, game_steps=None, run_log=None, board=None):
+        super().__init__()
+        self.stats = stats
+        self.run_log = run_log  # all-time history is read from here when the screen opens
+        self.board = board  # (grid width, grid height, players) of the game that just ended
+        self.expected_steps = expected_steps  # exact mean for this start (see analysis.py), None if not computed
+        self.game_steps = game_steps
+        self.size = size  # same window as the game that just ended
+        self.k2_mode = k2_mode
+        self.font = ("Arial", 16)
+        self.play_again_button = None
+        self.main_menu_button = None
 
+    def enter(self):
+        super().enter()
 
         self.screen.fill((255, 255, 255))  # White background
         #stats_font = pygame.font.SysFont('Verdana', 16)
@@ -153,119 +418,78 @@ class Game:
 
         # Display Total Steps for all grade levels
         total_steps_text = f"Total Steps: {self.stats.get_total_steps()}"
-        step_surface = self.font.render(total_steps_text, True, (0, 0, 0))
+        step_surface = render_text(total_steps_text, self.font, (0, 0, 0))
         self.screen.blit(step_surface, (self.screen.get_width() // 2 - 80, 80))
 
         # Check if the game was played in K-2 mode (2 players, fixed grid)
-        if len(self.players) == 2 and self.grid.cols == 6 and self.grid.rows == 6:
+        if self.k2_mode:
             # K-2 mode: Only display total steps
-            pygame.display.flip()
-            pygame.time.delay(5000)  # return to main menu after 5 seconds
-            from Main import main_game_gui
-            main_game_gui()  # return to main menu
+            self.start_timer(RETURN_TO_MENU, K2_STATS_DELAY)  # return to main menu after 5 seconds
             return
 
-        # stats for 3-5 and 6-8
-        longest_run_text = f"Longest Run: {self.stats.get_longest_run()} sec"
-        shortest_run_text = f"Shortest Run: {self.stats.get_shortest_run()} sec"
-        average_run_text = f"Average Run: {self.stats.get_average_run_time()} sec"
-
-
-        longest_surface = self.font.render(longest_run_text, True, (0, 0, 0))
-        shortest_surface = self.font.render(shortest_run_text, True, (0, 0, 0))
-        average_surface = self.font.render(average_run_text, True, (0, 0, 0))
-
-        self.screen.blit(longest_surface, (self.screen.get_width() // 2 - 100, 140))
-        self.screen.blit(shortest_surface, (self.screen.get_width() // 2 - 100, 180))
-        self.screen.blit(average_surface, (self.screen.get_width() // 2 - 100, 220))
-
-        play_again_button = Button(self.screen.get_width() // 2 - 100, 270, 90, 40, "Play Again")
-        main_menu_button = Button(self.screen.get_width() // 2 + 10, 270, 90, 40, "Main Menu")
-
-        play_again_button.draw_large(self.screen)
-        main_menu_button.draw_large(self.screen)
-
-        pygame.display.flip()
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-
-                    # Check if "Play Again" button is clicked
-                    if play_again_button.x <= mouse_pos[0] <= play_again_button.x + play_again_button.w and \
-                            play_again_button.y <= mouse_pos[1] <= play_again_button.y + play_again_button.h:
-
-
-
-                        if self.selection_func:
-                            print(
-                                f"🔄 Restarting with grid size ({self.grid.cols}, {self.grid.rows}) and {len(self.players)} players.")
-                            self.selection_func(self.grid.cols, self.grid.rows, len(self.players),stats=self.stats)
-
-                        return
-
-
-                    # Check if "Main Menu" button is clicked
-                    if main_menu_button.x <= mouse_pos[0] <= main_menu_button.x + main_menu_button.w and \
-                            main_menu_button.y <= mouse_pos[1] <= main_menu_button.y + main_menu_button.h:
-                        print("Returning to Main Menu...")
-                        from Main import main_game_gui
-                        main_game_gui()
-                        return
-
-    def run(self):
-        clock = pygame.time.Clock()
-        running = True
-
-        while running:
-            self.screen.fill((50, 50, 50))  # Background color during game
-            self.grid.draw(self.screen)  # Draw grid
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            # Move each group together
-            step_made = False  # Flag to ensure only one step is counted per full movement cycle
-            for group in self.groups:
-                leader = group[0]  # The leader moves first
-                old_x, old_y = leader.x, leader.y  # Store old position
-                leader.move()
-
-                # Check if the leader actually moved (to avoid counting unnecessary "movements")
-                if (leader.x, leader.y) != (old_x, old_y):
-                    step_made = True  # Only count a step if the leader moved
-
-                # Group members follow leader
-                for player in group[1:]:
-                    player.x, player.y = leader.x, leader.y
-
-            # Only increment step counter once if any player moved
-            if step_made:
-                self.stats.increment_steps()
-
-            # Debugging output
-            print(f"Total Steps: {self.stats.get_total_steps()}")
-
-            self.check_collisions()  # Check if players have met
-
-            # Draw players
-            for group in self.groups:
-                for player in group:
-                    pygame.draw.circle(
-                        self.screen,
-                        player.color,
-                        (player.x * self.grid.cell_size + self.grid.cell_size // 2,
-                         player.y * self.grid.cell_size + self.grid.cell_size // 2),
-                        self.grid.cell_size // 2 - 5
-                    )
-
-            pygame.display.flip()
-            clock.tick(10)  # player movement speed
-
-        pygame.quit()
-        sys.exit()
\ No newline at end of file
+        # stats for 3-5 and 6-8, one row each between the total and the buttons
+        rows = []
+        if self.expected_steps is not None:  # expected vs. actual for this start position
+            rows += [f"This Game: {self.game_steps} steps", f"Expected: {self.expected_steps:.1f} steps"]
+        rows += [f"Longest Run: {self.stats.get_longest_run()} sec",
+                 f"Shortest Run: {self.stats.get_shortest_run()} sec",
+                 f"Average Run: {self.stats.get_average_run_time()} sec"]
+        history = self.history()
+        if history:  # every game ever played on this board, from the run log
+            rows += [f"Games Here: {history['runs']}", f"Avg Steps Here: {history['average_steps']:.1f}"]
+
+        # Rows move closer on small boards so the buttons (10 px gap, 40 px, 10 px margin) stay inside the window
+        left = self.screen.get_width() // 2 - 100
+        spacing = min(STATS_ROW_SPACING, (self.screen.get_height() - STATS_TOP - 60) // len(rows))
+        for i, text in enumerate(rows):
+            self.screen.blit(render_text(text, self.font, (0, 0, 0)), (left, STATS_TOP + i * spacing))
+        buttons_y = STATS_TOP + len(rows) * spacing + 10
+
+        self.play_again_button = Button(left, buttons_y, 90, 40, "Play Again")
+        self.main_menu_button = Button(left + 110, buttons_y, 90, 40, "Main Menu")
+
+        self.play_again_button.draw_large(self.screen)
+        self.main_menu_button.draw_large(self.screen)
+
+    def history(self): # all-time results for this board, including the game that just ended, None if not logged
+        if self.run_log is None or self.board is None:
+            return None
+        return self.run_log.load_summary().get(self.board)  # games still queued are counted from memory
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.stack.quit()
+        elif event.type == RETURN_TO_MENU:
+            self.stack.pop_to_root()  # return to main menu
+        elif event.type == pygame.MOUSEBUTTONDOWN and self.play_again_button:
+            # Check if "Play Again" button is clicked: back to the start position picker below us
+            if self.play_again_button.is_clicked(event.pos):
+                logger.info("Restarting with the same grid size and players.")
+                self.stack.pop()
+
+            # Check if "Main Menu" button is clicked
+            elif self.main_menu_button.is_clicked(event.pos):
+                logger.info("Returning to Main Menu...")
+                self.stack.pop_to_root()
+
+
+def main(argv=None): # plays one game without the menus, e.g. on grids far bigger than the selection screen offers
+    parser = argparse.ArgumentParser(description="Play one Wandering in the Woods game without the menus.")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--seed", type=int, help="seed for the start cells and the game")
+    parser.add_argument("--random-start", action="store_true", help="random start cells instead of the corners")
+    parser.add_argument("--cell-size", type=int, default=40, help="initial zoom in pixels per cell")
+    args = parser.parse_args(argv)
+    if args.seed is not None and not 0 <= args.seed <= MAX_SEED:
+        parser.error(f"--seed must be between 0 and {MAX_SEED}")  # the run log and the recording store it
+
+    from sweep import corner_cells, start_positions
+    corners = not args.random_start and corner_cells(args.width, args.height, args.players) is not None
+    positions = start_positions(args.width, args.height, args.players, random.Random(args.seed), corners)
+    Game(args.width, args.height, positions, cell_size=args.cell_size, seed=args.seed).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,86 @@
 import pygame as pg
 
+MIN_LINE_CELL_SIZE = 4  # smaller cells are drawn without grid lines, they would turn the board black
+
 class Grid:
     def __init__(self, cols, rows, cell_size=40):
         self.cols = cols
         self.rows = rows
         self.cell_size = cell_size
+        self._surfaces = {}  # background color -> pre-rendered grid
+        self._view_surfaces = {}  # (background, cell size, view size) -> grid lines covering a camera's view
+
+    def cell_rect(self, x, y): # screen rectangle of a cell
+        return pg.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+
+    def cell_at(self, px, py): # cell under a point given relative to the grid's top left corner, None if outside
+        x, y = px // self.cell_size, py // self.cell_size
+        if px < 0 or py < 0 or x >= self.cols or y >= self.rows:
+            return None
+        return x, y
+
+    def surface(self, background=None): # grid lines rendered once (transparent if no background is given)
+        surface = self._surfaces.get(background)
+        if surface is None:
+            surface = pg.Surface((self.cols * self.cell_size, self.rows * self.cell_size))
+            if pg.display.get_surface():
+                surface = surface.convert()  # match the display format so blits are plain copies
+            if background is None:
+                surface.fill((255, 0, 255))
+                surface.set_colorkey((255, 0, 255))  # only the lines are blitted
+            else:
+                surface.fill(background)
+
+            for x in range(self.cols):
+                for y in range(self.rows):
+                    pg.draw.rect(surface, (0, 0, 0), self.cell_rect(x, y), 1)  # Black grid lines
+            self._surfaces[background] = surface
+        return surface
+
+    def view_surface(self, background, camera): # grid lines for one view and zoom, reused at every scroll position
+        key = (background, camera.cell_size, camera.view.size)
+        surface = self._view_surfaces.get(key)
+        if surface is None:
+            if len(self._view_surfaces) >= 4:
+                self._view_surfaces.clear()  # only the current zoom levels are worth keeping
+            size = camera.cell_size
+            # The lines repeat every cell, so one view plus a cell of slack covers any scroll offset
+            width, height = (camera.view.width // size + 2) * size, (camera.view.height // size + 2) * size
+            surface = pg.Surface((width, height))
+            if pg.display.get_surface():
+                surface = surface.convert()
+            if background is None:
+                surface.fill((255, 0, 255))
+                surface.set_colorkey((255, 0, 255))
+            else:
+                surface.fill(background)
+
+            if size >= MIN_LINE_CELL_SIZE:  # same pixels as outlining every cell with a 1 pixel rect
+                for x in range(0, width, size):
+                    pg.draw.line(surface, (0, 0, 0), (x, 0), (x, height - 1))
+                    pg.draw.line(surface, (0, 0, 0), (x + size - 1, 0), (x + size - 1, height - 1))
+                for y in range(0, height, size):
+                    pg.draw.line(surface, (0, 0, 0), (0, y), (width - 1, y))
+                    pg.draw.line(surface, (0, 0, 0), (0, y + size - 1), (width - 1, y + size - 1))
+            self._view_surfaces[key] = surface
+        return surface
+
+    def _blit_view(self, screen, rect, background, camera): # copies part of the view from the cached lines
+        left = camera.view.x - camera.x % camera.cell_size  # where the cached lines start on screen
+        top = camera.view.y - camera.y % camera.cell_size
+        screen.blit(self.view_surface(background, camera), rect, rect.move(-left, -top))
 
-    def draw(self, screen):
+    def draw(self, screen, background=None, camera=None): # whole grid, or only the part a camera.Camera sees
+        if camera is None:
+            screen.blit(self.surface(background), (0, 0))
+        else:
+            self._blit_view(screen, camera.grid_rect(), background, camera)
 
-        for x in range(self.cols):
-            for y in range(self.rows):
-                rect = pg.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
-                pg.draw.rect(screen, (0, 0, 0), rect, 1)  # Black grid lines
+    def draw_cells(self, screen, cells, background, camera): # restores (x, y) cells from the cached view, returns their rects
+        surface = self.view_surface(background, camera)
+        size, view, clip = camera.cell_size, camera.view, camera.grid_rect()
+        left, top = view.x - camera.x, view.y - camera.y  # screen position of cell (0, 0)
+        shift_x, shift_y = camera.x % size - view.x, camera.y % size - view.y  # screen -> cached lines
+        rects = [pg.Rect(left + x * size, top + y * size, size, size).clip(clip) for x, y in cells]
+        screen.blits([(surface, rect, rect.move(shift_x, shift_y)) for rect in rects], doreturn=False)
+        return rects
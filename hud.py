@@ -0,0 +1,81 @@
+import time
+from collections import deque
+
+import pygame as pg
+
+from fonts import get_font
+
+# Performance overlay drawn in the strip Game reserves under the grid.
+# Frame timings are collected every frame, but the text is only re-rendered a few times per second
+# into a cached surface, so drawing the HUD barely shows up in what it measures.
+# Readings are packed onto as few lines as the strip's width allows, so small boards (200 px wide) show them too.
+
+MARGIN = 10  # pixels left of the text
+LINE_SPACING = 22  # pixels per line, tighter when more lines are needed than fit the strip
+SEPARATOR = "    "
+
+
+class PerformanceHud:
+    def __init__(self, rect, refresh_interval=0.25, window=60, background=(30, 30, 30)):
+        self.rect = pg.Rect(rect)
+        self.refresh_interval = refresh_interval  # seconds between re-renders of the text
+        self.frames = deque(maxlen=window)  # (timestamp, simulation seconds, render seconds, steps)
+        self.background = background
+        self.font = get_font("Consolas", 14)
+        self.surface = None
+        self.last_refresh = 0.0
+
+    def invalidate(self): # forces a re-render on the next draw (e.g. after a full repaint)
+        self.surface = None
+
+    def record_frame(self, simulation_seconds, render_seconds, steps):
+        self.frames.append((time.perf_counter(), simulation_seconds, render_seconds, steps))
+
+    def readings(self, clock, group_count): # current readings as text, in display order
+        frames = self.frames
+        if len(frames) > 1:
+            elapsed = frames[-1][0] - frames[0][0]
+            steps_per_second = sum(frame[3] for frame in list(frames)[1:]) / elapsed if elapsed else 0.0
+        else:
+            steps_per_second = 0.0
+        simulation_ms = sum(frame[1] for frame in frames) / len(frames) * 1000 if frames else 0.0
+        render_ms = sum(frame[2] for frame in frames) / len(frames) * 1000 if frames else 0.0
+        return [
+            [f"FPS: {clock.get_fps():.1f}", f"Steps/s: {steps_per_second:.0f}"],
+            [f"Sim: {simulation_ms:.2f} ms/frame", f"Render: {render_ms:.2f} ms/frame"],
+            [f"Groups: {group_count}"],
+        ]
+
+    def lines(self, clock, group_count): # readings joined into lines that fit the strip's width
+        width = self.rect.width - 2 * MARGIN
+        lines = []
+        for group in self.readings(clock, group_count):  # readings of a group share a line when there is room
+            line = group[0]
+            for reading in group[1:]:
+                joined = line + SEPARATOR + reading
+                if self.font.size(joined)[0] <= width:
+                    line = joined
+                else:
+                    lines.append(line)
+                    line = reading
+            lines.append(line)
+        return lines
+
+    def draw(self, screen, clock, group_count): # blits the HUD, returns the rect to update (None if unchanged)
+        now = time.perf_counter()
+        if self.surface is not None and now - self.last_refresh < self.refresh_interval:
+            return None  # the strip still shows the last rendering
+
+        if self.surface is None:
+            self.surface = pg.Surface(self.rect.size)
+        self.surface.fill(self.background)
+        lines = self.lines(clock, group_count)
+        spacing = min(LINE_SPACING, max(self.font.get_linesize(), (self.rect.height - 8) // len(lines)))
+        y = 8
+        for line in lines:  # readings change every refresh, so skip the text cache
+            self.surface.blit(self.font.render(line, True, (220, 220, 220)), (MARGIN, y))
+            y += spacing
+        self.last_refresh = now
+
+        screen.blit(self.surface, self.rect)
+        return self.rect
@@ -0,0 +1,158 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+from collections import Counter, deque
+
+# Cheap per-frame timers and counters for the game loop.
+# Timings are collected per frame into a rolling in-memory buffer and can be exported as JSON lines.
+# When disabled, phase() hands back one shared do-nothing context manager, so the loop pays almost nothing.
+# scenes.SceneStack opens and closes the frames of a scene that has an Instrumentation and times event polling
+# and the display update itself; the scene times its own phases in between.
+#
+# Enable from the environment:  WANDERING_INSTRUMENT=1  (optionally WANDERING_INSTRUMENT_FILE=frames.jsonl,
+# WANDERING_PROFILE_EVERY=100 to run cProfile on every 100th frame, WANDERING_LOG_LEVEL=DEBUG)
+# StartupReport times the launch of Main.py up to the first menu frame; it is always logged at INFO, and
+# WANDERING_STARTUP_FILE=startup.jsonl keeps a history of launches.
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("events", "move", "collisions", "grid_draw", "player_draw", "display")
+
+
+class _NullTimer: # stands in for a phase timer when instrumentation is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _PhaseTimer: # adds the time spent inside a `with` block to the current frame
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        frame = self.owner.current
+        frame[self.name] = frame.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+class Instrumentation:
+    def __init__(self, enabled=False, buffer_size=600, export_path=None, profile_every=0, profile_hook=None):
+        self.enabled = enabled
+        self.frames = deque(maxlen=buffer_size)  # rolling buffer of per-frame phase timings
+        self.counters = Counter()
+        self.current = {}  # phase -> seconds for the frame being measured
+        self.export_path = export_path
+        self.profile_every = profile_every  # profile one frame out of this many (0 = never)
+        self.profile_hook = profile_hook  # called with pstats.Stats after each profiled frame
+        self.frame_index = 0
+        self._timers = {}
+        self._profiler = None
+        self._profiling = False
+
+    @classmethod
+    def from_environment(cls): # settings from WANDERING_* environment variables
+        return cls(enabled=os.environ.get("WANDERING_INSTRUMENT", "") not in ("", "0"),
+                   export_path=os.environ.get("WANDERING_INSTRUMENT_FILE"),
+                   profile_every=int(os.environ.get("WANDERING_PROFILE_EVERY", "0")))
+
+    def phase(self, name): # context manager timing one phase of the current frame
+        if not self.enabled:
+            return NULL_TIMER
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _PhaseTimer(self, name)
+        return timer
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] += amount
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        if self.profile_every and self.frame_index % self.profile_every == 0:
+            if self._profiler is None:
+                self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            self._profiling = True
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        if self._profiling:
+            self._profiler.disable()
+            self._profiling = False
+            if self.profile_hook:
+                self.profile_hook(pstats.Stats(self._profiler))
+        self.frames.append(self.current)
+        self.frame_index += 1
+
+    def averages(self): # mean seconds per frame for each phase over the buffer
+        if not self.frames:
+            return {}
+        totals = Counter()
+        for frame in self.frames:
+            totals.update(frame)
+        return {name: total / len(self.frames) for name, total in totals.items()}
+
+    def profile_stats(self): # accumulated profile of all sampled frames (None if nothing was profiled)
+        return pstats.Stats(self._profiler) if self._profiler else None
+
+    def export(self, path=None): # writes the buffered frames (and counters) as JSON lines
+        path = path or self.export_path
+        if not path or not self.enabled:
+            return None
+        with open(path, "a") as file:
+            for frame in self.frames:
+                file.write(json.dumps(frame) + "\n")
+            file.write(json.dumps({"counters": dict(self.counters)}) + "\n")
+        if self._profiler:
+            self._profiler.dump_stats(path + ".prof")
+        logger.info("Wrote %d instrumented frames to %s", len(self.frames), path)
+        return path
+
+
+class StartupReport: # time from launch to the first menu frame, split into named phases
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []  # (phase, seconds since the previous mark)
+        self._last = self.start
+
+    def mark(self, name): # ends the phase that started at the previous mark
+        now = time.perf_counter()
+        self.marks.append((name, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.start
+
+    def report(self, path=None): # logs the phases and appends them as a JSON line to WANDERING_STARTUP_FILE
+        logger.info("Startup took %.0f ms (%s)", self.total() * 1000,
+                    ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.marks))
+        path = path or os.environ.get("WANDERING_STARTUP_FILE")
+        if path:
+            record = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "total_ms": self.total() * 1000,
+                      "phases_ms": {name: seconds * 1000 for name, seconds in self.marks}}
+            with open(path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+        return self.marks
+
+
+def configure_logging(): # leveled logging for the game, WANDERING_LOG_LEVEL picks the level (default INFO)
+    logging.basicConfig(level=os.environ.get("WANDERING_LOG_LEVEL", "INFO").upper(),
+                        format="%(levelname)s %(name)s: %(message)s")
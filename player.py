@@ -1,42 +1,37 @@
-import pygame as pg
-import random
-
-class Player:  # Player position
-    def __init__(self, player_id, x, y, grid_size, color, stats, cell_size=40):  # Include stats tracker
-        self.player_id = player_id
-        self.x = x
-        self.y = y
-        self.grid_size = grid_size  # (cols, rows)
-        self.color = color # Assigned color
-        self.cell_size = cell_size  # dynamic cell size
-        self.rect = pg.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
-
-        self.group = [self]
-
-    def move(self):
-        if len(self.group) > 1:
-            # Group moves as a unit
-            leader = self.group[0]  # The first player in the group is the leader
-            directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # Random movements in all 4 directions
-            dx, dy = random.choice(directions)
-            new_x, new_y = leader.x + dx, leader.y + dy
-
-            if 0 <= new_x < self.grid_size[0] and 0 <= new_y < self.grid_size[1]:
-                for p in self.group:
-                    p.x, p.y = new_x, new_y
-        else:
-            # Move individually
-            directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-            dx, dy = random.choice(directions)
-            new_x, new_y = self.x + dx, self.y + dy
-
-            if 0 <= new_x < self.grid_size[0] and 0 <= new_y < self.grid_size[1]:
-                self.x, self.y = new_x, new_y
-
-        self.update_position()
-
-    def update_position(self): # updates player rectangle position
-        self.rect.topleft = (self.x * self.cell_size, self.y * self.cell_size)
-
-    def draw(self, screen): # draws the player on the grid
-        pg.draw.rect(screen, self.color, self.rect)
+import colorsys
+from array import array
+
+from simulation import Population, Walker
+
+BASE_COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]  # the classic four players
+PALETTE_SIZE = 64  # distinct colors before they repeat, players store a one-byte index into the palette
+
+
+def palette(count): # count colors: the classic four first, then hues spread by the golden angle
+    colors = BASE_COLORS[:count]
+    hue = 0.0
+    for i in range(count - len(colors)):
+        hue = (hue + 0.618033988749895) % 1.0
+        value = (1.0, 0.75, 0.9)[i % 3]  # vary brightness too, so neighbouring hues stay apart
+        r, g, b = colorsys.hsv_to_rgb(hue, 0.85, value)
+        colors.append((round(r * 255), round(g * 255), round(b * 255)))
+    return colors
+
+
+class Player(Walker):  # a player on screen: a view of its Players entry that also knows its color
+    __slots__ = ()
+
+    @property
+    def color(self):
+        players = self.population
+        return players.palette[players.colors[self.index]]
+
+
+class Players(Population):  # positions plus a color per player, for the game window
+    view = Player
+
+    def __init__(self, positions, colors=None):
+        super().__init__(positions)
+        self.palette = list(colors) if colors else palette(min(len(self.xs), PALETTE_SIZE))
+        size = len(self.palette)
+        self.colors = array("B", (i % size for i in range(len(self.xs))))  # index into palette, per player
@@ -0,0 +1,208 @@
+### Compact move recordings of finished games, and seekable playback ###
+
+# A recording is the start of the game plus every group's direction for every movement cycle, packed
+# 2 bits per direction (the index into simulation.DIRECTIONS). Every KEYFRAME_INTERVAL cycles the group
+# positions and memberships are stored as well, so playback can jump to any step by restoring the keyframe
+# before it and re-applying at most KEYFRAME_INTERVAL cycles of moves. Replaying the moves under the current
+# rules and comparing the outcome with the recorded one checks a rule change against old games.
+#
+# Example: python replay.py            (plays the newest recorded game from game_runs.db)
+#          python replay.py 42 --verify
+
+import argparse
+import struct
+import sys
+from bisect import bisect_right
+
+from simulation import Population, Simulation
+
+MAGIC = b"WWRP"
+VERSION = 1
+KEYFRAME_INTERVAL = 1024  # movement cycles between keyframes, the most a seek has to re-apply
+MAX_PLAYERS = 255  # player ids and indices are stored in one byte
+MAX_SIDE = 65535  # grid sizes and positions are stored in two bytes
+MAX_SEED = 2 ** 64 - 1  # seeds are stored unsigned in eight bytes
+
+HEADER = struct.Struct("<4sBHHBQIIIIII")  # magic, version, width, height, players, seed, keyframe interval,
+                                          # ticks, steps, meetings, keyframes, move bytes
+POSITION = struct.Struct("<HH")
+MEETING = struct.Struct("<IB")  # step, group size, then one byte per player id
+KEYFRAME = struct.Struct("<IIQB")  # tick, steps, offset into the move stream (in directions), groups
+GROUP = struct.Struct("<BHHB")  # root, x, y, members, then one byte per member index
+
+
+def can_record(sim): # True if the game's players, grid and seed fit the recording format
+    return (len(sim.players) <= MAX_PLAYERS and sim.grid_width <= MAX_SIDE and sim.grid_height <= MAX_SIDE
+            and isinstance(sim.seed, int) and 0 <= sim.seed <= MAX_SEED)
+
+
+class MoveRecorder:  # attached to a Simulation, writes down every move it makes
+    def __init__(self, sim, keyframe_interval=KEYFRAME_INTERVAL):
+        if not can_record(sim):
+            raise ValueError(f"recordings support at most {MAX_PLAYERS} players, grids up to {MAX_SIDE} cells "
+                             f"a side and seeds from 0 to {MAX_SEED}")
+        self.sim = sim
+        self.keyframe_interval = keyframe_interval
+        self.start = sim.players.positions()
+        self.keyframes = []  # (tick, steps, offset, snapshot)
+        self.moves = bytearray()
+        self.count = 0  # directions written so far
+        sim.recorder = self
+
+    def record(self, sim, directions): # called by Simulation.apply_moves before the groups move
+        if sim.ticks % self.keyframe_interval == 0:
+            self.keyframes.append((sim.ticks, sim.steps, self.count, sim.snapshot()))
+        moves, count = self.moves, self.count
+        for direction in directions:
+            shift = (count & 3) * 2
+            if not shift:
+                moves.append(direction)
+            else:
+                moves[-1] |= direction << shift
+            count += 1
+        self.count = count
+
+    def to_bytes(self): # the recording so far, normally called once the game is finished
+        sim = self.sim
+        parts = [HEADER.pack(MAGIC, VERSION, sim.grid_width, sim.grid_height, len(self.start), sim.seed,
+                             self.keyframe_interval, sim.ticks, sim.steps, len(sim.meetings), len(self.keyframes),
+                             len(self.moves))]
+        parts += [POSITION.pack(x, y) for x, y in self.start]
+        for step, group in sim.meetings:
+            parts += [MEETING.pack(step, len(group)), bytes(group)]
+        for tick, steps, offset, groups in self.keyframes:
+            parts.append(KEYFRAME.pack(tick, steps, offset, len(groups)))
+            for root, (x, y), members in groups:
+                parts += [GROUP.pack(root, x, y, len(members)), bytes(members)]
+        parts.append(bytes(self.moves))
+        return b"".join(parts)
+
+
+class Replay:  # a parsed recording
+    def __init__(self, data):
+        (magic, version, self.grid_width, self.grid_height, players, self.seed, self.keyframe_interval,
+         self.ticks, self.steps, meeting_count, keyframe_count, move_bytes) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Wandering in the Woods recording (or a newer version)")
+        offset = HEADER.size
+
+        self.positions = []
+        for _ in range(players):
+            self.positions.append(POSITION.unpack_from(data, offset))
+            offset += POSITION.size
+
+        self.meetings = []  # (step, player ids) like Simulation.meetings
+        for _ in range(meeting_count):
+            step, size = MEETING.unpack_from(data, offset)
+            offset += MEETING.size
+            self.meetings.append((step, tuple(data[offset:offset + size])))
+            offset += size
+
+        self.keyframes = []  # (tick, steps, offset, snapshot)
+        for _ in range(keyframe_count):
+            tick, steps, move_offset, group_count = KEYFRAME.unpack_from(data, offset)
+            offset += KEYFRAME.size
+            groups = []
+            for _ in range(group_count):
+                root, x, y, size = GROUP.unpack_from(data, offset)
+                offset += GROUP.size
+                groups.append((root, (x, y), list(data[offset:offset + size])))
+                offset += size
+            self.keyframes.append((tick, steps, move_offset, groups))
+        self._keyframe_steps = [steps for _, steps, _, _ in self.keyframes]
+
+        self.moves = bytes(data[offset:offset + move_bytes])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls(file.read())
+
+    def simulation(self, players=None): # a fresh game at the recorded start, on the given Population if any
+        if players is None:
+            players = Population(self.positions)
+        return Simulation(self.grid_width, self.grid_height, players, seed=self.seed)
+
+    def playback(self, sim=None):
+        return Playback(self, sim if sim is not None else self.simulation())
+
+    def verify(self): # True if the recorded moves still give the recorded outcome under the current rules
+        playback = self.playback()
+        while playback.advance():
+            playback.sim.check_collisions()
+        return playback.sim.steps == self.steps and playback.sim.meetings == self.meetings
+
+
+class Playback:  # feeds a recording's moves into a Simulation instead of its random number generator
+    def __init__(self, replay, sim):
+        self.replay = replay
+        self.sim = sim
+        self.offset = 0  # next direction in the move stream
+
+    @property
+    def finished(self): # the recording has no more moves
+        return self.sim.ticks >= self.replay.ticks
+
+    def advance(self): # applies the next cycle's moves (the caller checks collisions), False at the end
+        if self.finished:
+            return False
+        moves, offset = self.replay.moves, self.offset
+        count = self.sim.union_find.count  # one direction per group
+        self.sim.apply_moves([(moves[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(offset, offset + count)])
+        self.offset = offset + count
+        return True
+
+    def seek(self, step): # jumps to the first cycle that reaches this step, from the keyframe before it
+        replay, sim = self.replay, self.sim
+        step = max(0, min(step, replay.steps))
+        index = bisect_right(replay._keyframe_steps, step) - 1
+        if index < 0:
+            return  # nothing was recorded (the players started on one cell)
+        tick, steps, offset, groups = replay.keyframes[index]
+        if not tick <= sim.ticks or sim.steps > step:  # otherwise just play on from where we are
+            self.offset = offset
+            sim.restore(groups, steps, tick, [meeting for meeting in replay.meetings if meeting[0] <= steps])
+        while sim.steps < step and self.advance():
+            sim.check_collisions()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded Wandering in the Woods game.")
+    parser.add_argument("run", nargs="?", type=int, help="run id in the run log (default: the newest game)")
+    parser.add_argument("--db", default="game_runs.db", help="run log to read the recording from")
+    parser.add_argument("--file", help="read the recording from this file instead")
+    parser.add_argument("--save", help="write the recording to this file and exit")
+    parser.add_argument("--verify", action="store_true", help="check the recording against the current rules")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        with open(args.file, "rb") as file:
+            data = file.read()
+    else:
+        from runlog import RunLog
+        run_log = RunLog(args.db)
+        data = run_log.load_replay(args.run)
+        run_log.close()
+    if data is None:
+        print("no recording found")
+        return 1
+
+    replay = Replay(data)
+    print(f"{replay.grid_width}x{replay.grid_height}, {len(replay.positions)} players, seed {replay.seed}: "
+          f"{replay.steps} steps, {len(data)} bytes")
+    if args.save:
+        with open(args.save, "wb") as file:
+            file.write(data)
+        return 0
+    if args.verify:
+        ok = replay.verify()
+        print("matches the current rules" if ok else "DIFFERS under the current rules")
+        return 0 if ok else 1
+
+    from game import Game
+    Game.from_replay(replay).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+# Append-only history of every finished game, stored in a local SQLite database (WAL mode).
+# Games are queued by the UI and written in batches by a background thread, so finishing a game
+# never waits on the disk. A summary table is updated in the same transaction as the inserts,
+# so loading the all-time aggregates costs the same after 10 or 100,000 games. Games still waiting in
+# the queue are added to the aggregates from memory, so reading them never forces a write.
+
+DEFAULT_PATH = "game_runs.db"
+MAX_SEED = 2 ** 63 - 1  # seeds are stored as SQLite integers, which are signed 64-bit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    grid_width INTEGER NOT NULL,
+    grid_height INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    seed INTEGER,
+    steps INTEGER NOT NULL,
+    duration REAL,
+    meetings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS replays (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id),
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summary (
+    grid_width INTEGER NOT NULL,
+    grid_height INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    total_steps INTEGER NOT NULL,
+    min_steps INTEGER NOT NULL,
+    max_steps INTEGER NOT NULL,
+    timed_runs INTEGER NOT NULL,
+    total_duration REAL NOT NULL,
+    min_duration REAL,
+    max_duration REAL,
+    PRIMARY KEY (grid_width, grid_height, players)
+);
+"""
+
+UPDATE_SUMMARY = """
+INSERT INTO summary VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (grid_width, grid_height, players) DO UPDATE SET
+    runs = runs + 1,
+    total_steps = total_steps + excluded.total_steps,
+    min_steps = min(min_steps, excluded.min_steps),
+    max_steps = max(max_steps, excluded.max_steps),
+    timed_runs = timed_runs + excluded.timed_runs,
+    total_duration = total_duration + excluded.total_duration,
+    min_duration = coalesce(min(min_duration, excluded.min_duration), min_duration, excluded.min_duration),
+    max_duration = coalesce(max(max_duration, excluded.max_duration), max_duration, excluded.max_duration)
+"""
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # tells the writer thread to finish
+_FLUSH = object()  # tells the writer thread to write its batch now instead of waiting for more rows
+
+
+class RunLog:
+    def __init__(self, path=DEFAULT_PATH, batch_size=64, flush_interval=2.0):
+        self.path = path
+        self.batch_size = batch_size  # rows written per transaction at most
+        self.flush_interval = flush_interval  # seconds a row may wait before being written
+        self._queue = queue.Queue()
+        self._closed = False
+        self._pending = []  # queued rows not yet committed, oldest first
+        self._lock = threading.Lock()  # held while a batch commits and leaves _pending, and while reading both
+
+        with self._connect() as connection:  # create the tables before anyone reads them
+            connection.executescript(SCHEMA)
+        connection.close()
+
+        self._thread = threading.Thread(target=self._writer, name="run-log-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # WAL keeps this durable across app crashes
+        return connection
+
+    def record(self, grid_width, grid_height, players, seed, steps, duration, meetings, replay=None):
+        # queues one finished game, replay is its replay.MoveRecorder bytes if it was recorded
+        if self._closed:
+            raise RuntimeError("run log is closed")
+        row = (time.time(), grid_width, grid_height, players, seed, steps, duration,
+               json.dumps([[step, list(group)] for step, group in meetings]), replay)
+        with self._lock:
+            self._pending.append(row)
+            self._queue.put(row)
+
+    def flush(self): # blocks until every queued game is on disk
+        if not self._closed:
+            self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self): # writes what is left and stops the writer thread
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _writer(self): # background thread: collects rows and writes them in batches
+        connection = self._connect()
+        cursor = connection.cursor()  # one cursor for every write: sqlite3 tracks each new one until its next purge
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    row = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                if row is _FLUSH:
+                    self._queue.task_done()
+                    break
+                batch.append(row)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if not batch:
+                continue
+
+            try:
+                with self._lock, connection:  # one transaction per batch
+                    try:
+                        for row in batch:
+                            run_id = cursor.execute(
+                                "INSERT INTO runs (finished_at, grid_width, grid_height, players, seed, steps,"
+                                " duration, meetings) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row[:8]).lastrowid
+                            if row[8] is not None:
+                                cursor.execute("INSERT INTO replays VALUES (?, ?)", (run_id, row[8]))
+                        cursor.executemany(UPDATE_SUMMARY, [
+                            (width, height, players, steps, steps, steps, int(duration is not None),
+                             duration or 0.0, duration, duration)
+                            for _, width, height, players, _, steps, duration, _, _ in batch])
+                    finally:
+                        del self._pending[:len(batch)]  # committed, or lost with the batch below
+            except (sqlite3.Error, OverflowError) as e:  # a bad batch is lost, the writer keeps going
+                logger.error("Error writing run log: %s", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    def load_summary(self): # all-time aggregates per (width, height, players), including games not yet written
+        connection = self._connect()
+        try:
+            with self._lock:  # a batch is either in the table or still pending, never both
+                rows = connection.execute(
+                    "SELECT grid_width, grid_height, players, runs, total_steps, min_steps, max_steps,"
+                    " timed_runs, total_duration, min_duration, max_duration FROM summary").fetchall()
+                pending = list(self._pending)
+        finally:
+            connection.close()
+
+        totals = {tuple(row[:3]): list(row[3:]) for row in rows}
+        for _, width, height, players, _, steps, duration, _, _ in pending:
+            total = totals.setdefault((width, height, players), [0, 0, steps, steps, 0, 0.0, duration, duration])
+            total[0] += 1
+            total[1] += steps
+            total[2], total[3] = min(total[2], steps), max(total[3], steps)
+            if duration is not None:
+                total[4] += 1
+                total[5] += duration
+                total[6] = duration if total[6] is None else min(total[6], duration)
+                total[7] = duration if total[7] is None else max(total[7], duration)
+
+        summary = {}
+        for (width, height, players), (runs, total_steps, min_steps, max_steps, timed_runs, total_duration,
+                                       min_duration, max_duration) in totals.items():
+            summary[(width, height, players)] = {
+                "runs": runs,
+                "average_steps": total_steps / runs,
+                "min_steps": min_steps,
+                "max_steps": max_steps,
+                "average_duration": total_duration / timed_runs if timed_runs else None,
+                "min_duration": min_duration,
+                "max_duration": max_duration,
+            }
+        return summary
+
+    def recent_runs(self, limit=20): # newest games first, with their meeting order decoded
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT finished_at, grid_width, grid_height, players, seed, steps, duration, meetings"
+                " FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        finally:
+            connection.close()
+        return [row[:7] + (json.loads(row[7]),) for row in rows]
+
+    def load_replay(self, run_id=None): # recording of a game (the newest recorded one by default), None if missing
+        connection = self._connect()
+        try:
+            if run_id is None:
+                row = connection.execute("SELECT data FROM replays ORDER BY run_id DESC LIMIT 1").fetchone()
+            else:
+                row = connection.execute("SELECT data FROM replays WHERE run_id = ?", (run_id,)).fetchone()
+        finally:
+            connection.close()
+        return row[0] if row else None
+
+
+_default_log = None
+
+
+def get_run_log(): # shared run log for the GUI, opened on first use and flushed at exit
+    global _default_log
+    if _default_log is None:
+        _default_log = RunLog()
+        atexit.register(_default_log.close)
+    return _default_log
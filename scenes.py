@@ -0,0 +1,173 @@
+import logging
+
+import pygame as pg
+
+from instrumentation import Instrumentation
+
+# One top-level loop drives every screen of the game through a stack of scenes.
+# Screens no longer "return" by calling the next screen's function, so Python frames don't pile up
+# and a screen's UI manager, surfaces and Game object are released as soon as it leaves the stack.
+
+logger = logging.getLogger(__name__)
+
+NO_INSTRUMENTATION = Instrumentation()  # disabled, used for scenes that do not measure their frames
+
+
+class Scene:  # one screen (menu, about, selection, placement, game, stats)
+    size = (325, 500)  # window size used while this scene is on top
+    caption = "Wandering in the Woods"
+    frame_rate = 60  # frames per second while this scene is on top
+    # How the scene waits for its next frame: None runs every frame at frame_rate,
+    # 0 sleeps until an event arrives, n also wakes up after n ms without events
+    wait_timeout = None
+    instrumentation = None  # an instrumentation.Instrumentation timing this scene's frames, if it has one
+
+    def __init__(self):
+        self.stack = None  # set by SceneStack when the scene is pushed
+        self.screen = None
+        self.timers = set()  # custom event types with a pending pygame timer
+
+    def enter(self): # scene is now on top: set up the window and anything it needs to draw
+        self.screen = pg.display.set_mode(self.size)
+        pg.display.set_caption(self.caption)
+
+    def exit(self): # scene was covered or removed: free what enter() created
+        for event_type in self.timers:
+            pg.time.set_timer(event_type, 0)  # a timer must not fire into the next screen
+        self.timers.clear()
+        self.screen = None
+
+    def start_timer(self, event_type, delay): # posts event_type once after delay ms, without blocking the loop
+        if delay <= 0:
+            pg.event.post(pg.event.Event(event_type))
+        else:
+            pg.time.set_timer(event_type, delay, loops=1)
+            self.timers.add(event_type)
+
+    def handle_event(self, event): # default: closing the window goes back one screen
+        if event.type == pg.QUIT:
+            self.stack.pop()
+
+    def update(self, dt): # advance time-based state, dt in seconds
+        pass
+
+    def draw(self): # draw the frame, return True (update everything), a list of dirty rects, or None (unchanged)
+        return None  # the stack shows the whole window after enter() and when it is exposed
+
+
+class SceneStack:
+    def __init__(self, max_frame_rate=None):
+        self.scenes = []
+        self.clock = pg.time.Clock()
+        self.max_frame_rate = max_frame_rate  # overrides every scene's frame rate (0 = unlimited), used for soak runs
+        self.running = False
+        self._pending = []  # transitions requested during this frame, applied once the frame is done
+        self._full_update = False  # the whole window must be shown (new scene on top, window exposed)
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    # Transitions are queued so a scene can request one from inside its own event handler
+    def push(self, scene):
+        self._pending.append(("push", scene))
+
+    def pop(self, count=1):
+        self._pending.append(("pop", count))
+
+    def replace(self, scene): # swap the top scene for another one
+        self._pending.append(("pop", 1))
+        self._pending.append(("push", scene))
+
+    def pop_to_root(self): # back to the first scene (the main menu)
+        self._pending.append(("pop", None))
+
+    def quit(self):
+        self._pending.append(("quit", None))
+
+    def apply_transitions(self):
+        if not self._pending:
+            return False
+        pending, self._pending = self._pending, []
+        previous_top = self.top
+
+        for action, value in pending:
+            if action == "push":
+                value.stack = self
+                self.scenes.append(value)
+            elif action == "pop":
+                count = len(self.scenes) - 1 if value is None else value
+                for _ in range(min(count, len(self.scenes))):
+                    self._remove(self.scenes.pop(), previous_top)
+            elif action == "quit":
+                self.running = False
+                while self.scenes:
+                    self._remove(self.scenes.pop(), previous_top)
+
+        if previous_top is not None and previous_top in self.scenes and previous_top is not self.top:
+            previous_top.exit()  # covered by a new scene
+        if self.top is not None and self.top is not previous_top:
+            logger.debug("Entering %s", type(self.top).__name__)
+            self.top.enter()
+            self._full_update = True
+        return True
+
+    def _remove(self, scene, previous_top):
+        if scene is previous_top:
+            scene.exit()  # only the scene that was on top has entered resources to free
+        scene.stack = None
+
+    def wait_for_events(self, timeout): # sleeps until an event arrives (or timeout ms pass), then takes the whole queue
+        event = pg.event.wait(timeout)
+        events = [] if event.type == pg.NOEVENT else [event]
+        events.extend(pg.event.get())
+        return events
+
+    def tick(self): # runs one frame of the top scene
+        scene = self.top
+        instrumentation = scene.instrumentation or NO_INSTRUMENTATION
+        if scene.wait_timeout is None:
+            rate = scene.frame_rate if self.max_frame_rate is None else self.max_frame_rate
+            dt = self.clock.tick(rate) / 1000
+            instrumentation.begin_frame()  # after the frame rate wait, so the frame holds only the work
+            with instrumentation.phase("events"):
+                events = pg.event.get()
+        else:
+            # Idle screens sleep in SDL instead of spinning; one that was just entered is drawn straight away
+            events = pg.event.get() if self._full_update else self.wait_for_events(scene.wait_timeout)
+            dt = self.clock.tick() / 1000
+            instrumentation.begin_frame()  # the sleep until the next event is not part of the frame
+
+        for event in events:
+            if event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                self._full_update = True  # the window contents were lost
+            scene.handle_event(event)
+            if self._pending:
+                break  # the rest of this frame's events belonged to the old screen
+
+        if not self._pending:
+            scene.update(dt)
+        if self._pending:
+            instrumentation.end_frame()
+            self.apply_transitions()
+            return
+
+        dirty = scene.draw()
+        with instrumentation.phase("display"):
+            if dirty is True or self._full_update:
+                self._full_update = False
+                pg.display.update()
+            elif dirty:
+                pg.display.update(dirty)
+        instrumentation.end_frame()
+
+    def run(self, root, on_first_frame=None): # main loop: runs until the last scene is popped or quit() is called
+        self.running = True
+        self.push(root)
+        self.apply_transitions()
+        if self.running and self.scenes:
+            self.tick()
+            if on_first_frame:
+                on_first_frame()  # the first screen has been drawn (used for the startup report)
+        while self.running and self.scenes:
+            self.tick()
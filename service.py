@@ -0,0 +1,426 @@
+### Local simulation service shared by several front-ends ###
+
+# One simulation backend per machine for the classroom front-ends and the analysis notebooks. Clients connect
+# over loopback (TCP on 127.0.0.1, or a Unix socket where the platform has them) and exchange JSON lines:
+#
+#   -> {"op": "submit", "job": "a", "width": 6, "height": 6, "positions": [[0, 0], [5, 5]], "seed": 1, "runs": 1000}
+#   <- {"event": "accepted", "job": "a", "seed": 1, "runs": 1000, "queued": 1}
+#   <- {"event": "progress", "job": "a", "done": 250, "runs": 1000, "summary": {...}}   (as chunks finish)
+#   <- {"event": "done", "job": "a", "done": 1000, "runs": 1000, "summary": {...}}
+#   -> {"op": "cancel", "job": "a"}   <- {"event": "cancelled", "job": "a", "done": ..., "summary": {...}}
+#   -> {"op": "status"}               <- {"event": "status", "queued": ..., "active": ..., "jobs": [...]}
+#
+# Games are headless simulation.Simulation games (the same movement and merge rules as the game), played in
+# chunks on a process pool. Jobs take turns chunk by chunk, so one long job does not hold up everyone else.
+# A job's first chunk is a single game; later chunks are sized from the measured time per game to take about
+# CHUNK_SECONDS, so progress keeps coming and a cancelled job stops within about that long on any grid size.
+# Run i of a job gets a seed derived from the job's seed and i, and chunks are added to the summary in order,
+# so a job's result does not depend on the chunking or the number of workers. Summaries are Stats-style:
+# games, total steps, shortest/average/longest and approximate percentiles.
+#
+# Limits keep one client from swamping the others: MAX_JOBS_PER_CLIENT unfinished jobs per connection and
+# MAX_ACTIVE_JOBS in total (further submits are rejected with a reason, so the client can back off and retry),
+# MAX_RUNS games per job and MAX_STEPS steps per game (longer games are given up and counted as unfinished).
+# A client that does not read its replies gets no progress events until it catches up, and its next request is
+# not read until its replies are sent. Closing the connection cancels the client's jobs.
+#
+# Example: python service.py serve --workers 4
+#          python service.py run 6 6 0,0 5,5 --runs 10000 --seed 1
+# From a notebook: summary = (await run_job(6, 6, [(0, 0), (5, 5)], runs=10000, seed=1))["summary"]
+
+import argparse
+import asyncio
+import ipaddress
+import itertools
+import json
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from instrumentation import configure_logging
+from simulation import Simulation
+from stats import Stats
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"  # loopback only, the service is not meant to be reachable from other machines
+PORT = 8765
+CHUNK_SECONDS = 0.5  # target duration of one task sent to a worker, and so of the gap between progress events
+MAX_CHUNK_SIZE = 10000  # games per task, however fast they are
+MAX_JOBS_PER_CLIENT = 4
+MAX_ACTIVE_JOBS = 64  # queued or running, over all clients
+MAX_RUNS = 1000000
+MAX_STEPS = 10000000
+MAX_LINE = 1024 * 1024  # bytes per request or reply line
+HIGH_WATER = 256 * 1024  # unsent reply bytes above which a client's progress events are skipped
+
+
+def is_loopback(host): # True if host names this machine only, e.g. 127.0.0.1, ::1 or localhost
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def run_seed(job_seed, run): # seed of one run of a job, independent of scheduling
+    return random.Random(f"{job_seed}:{run}").getrandbits(64)
+
+
+def run_chunk(width, height, positions, job_seed, first, last, max_steps): # worker: plays runs [first, last)
+    start = time.perf_counter()
+    steps, unfinished = [], 0
+    for run in range(first, last):
+        sim = Simulation.from_positions(width, height, positions, seed=run_seed(job_seed, run))
+        sim.run(max_steps)
+        if sim.finished:
+            steps.append(sim.steps)
+        else:
+            unfinished += 1
+    return steps, unfinished, time.perf_counter() - start
+
+
+def summarize(stats, unfinished=0): # Stats-style summary of the finished games of a job
+    return {
+        "games": stats.step_runs.summary.count,
+        "unfinished": unfinished,
+        "total_steps": stats.get_total_steps(),
+        "shortest_steps": stats.get_shortest_steps(),
+        "average_steps": stats.get_average_steps(),
+        "longest_steps": stats.get_longest_steps(),
+        "step_percentiles": {f"p{p}": value for p, value in stats.get_step_percentiles().items()},
+    }
+
+
+def parse_job(request, max_runs=MAX_RUNS): # (width, height, positions, seed, runs) of a submit, ValueError if invalid
+    try:
+        width, height = int(request["width"]), int(request["height"])
+        positions = [(int(x), int(y)) for x, y in request["positions"]]
+        runs = int(request.get("runs", 1))
+        seed = request.get("seed")
+        seed = random.getrandbits(64) if seed is None else int(seed)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("a job needs an integer width and height, positions as [x, y] pairs, and optionally "
+                         "integer runs and seed") from None
+    if width < 1 or height < 1:
+        raise ValueError("the grid needs at least one row and one column")
+    if not positions:
+        raise ValueError("a job needs at least one player")
+    if any(not (0 <= x < width and 0 <= y < height) for x, y in positions):
+        raise ValueError("every player must start on the grid")
+    if len(set(positions)) != len(positions):
+        raise ValueError("players may not start on the same cell")
+    if not 1 <= runs <= max_runs:
+        raise ValueError(f"runs must be between 1 and {max_runs}")
+    return width, height, positions, seed, runs
+
+
+class Job:
+    def __init__(self, client, name, width, height, positions, seed, runs):
+        self.client = client
+        self.name = name
+        self.width = width
+        self.height = height
+        self.positions = positions
+        self.seed = seed
+        self.runs = runs
+        self.stats = Stats()
+        self.unfinished = 0  # games given up after max_steps
+        self.next_run = 0  # first run of the next chunk to hand out
+        self.done = 0  # runs added to stats, always a prefix of the job
+        self.results = {}  # first run of a chunk that finished out of order -> (last, steps, unfinished)
+        self.finished = False  # done, cancelled or failed; chunks still running are then ignored
+        self.timed_games = 0  # games of finished chunks, and the seconds they took
+        self.timed_seconds = 0.0
+        self.last_chunk = 0
+
+    def chunk_size(self): # games in the next chunk: about CHUNK_SECONDS, at most twice the previous chunk
+        if not self.timed_games:
+            size = 1
+        else:  # game lengths vary a lot, so the average only grows the chunks step by step
+            size = int(CHUNK_SECONDS * self.timed_games / max(self.timed_seconds, 1e-9))
+            size = max(1, min(size, 2 * self.last_chunk, MAX_CHUNK_SIZE))
+        self.last_chunk = size
+        return size
+
+    def add(self, first, last, steps, unfinished): # adds a chunk's games once every earlier chunk is in
+        self.results[first] = (last, steps, unfinished)
+        while self.done in self.results:
+            last, steps, unfinished = self.results.pop(self.done)
+            for count in steps:
+                self.stats.total_steps += count
+                self.stats.record_step_run(count)
+            self.unfinished += unfinished
+            self.done = last
+
+    def report(self, event): # message about this job's progress so far
+        return {"event": event, "job": self.name, "done": self.done, "runs": self.runs,
+                "summary": summarize(self.stats, self.unfinished)}
+
+
+class Client:
+    def __init__(self, writer, name):
+        self.writer = writer
+        self.name = name
+        self.jobs = {}  # job name -> unfinished Job
+        self.job_numbers = itertools.count(1)  # names for jobs submitted without one
+
+    def send(self, message, final=True): # queues a reply; progress (final=False) is skipped while the client lags
+        if self.writer.is_closing():
+            return False
+        if not final and self.writer.transport.get_write_buffer_size() > HIGH_WATER:
+            return False
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        return True
+
+
+class SimulationService:
+    def __init__(self, workers=None, max_jobs_per_client=MAX_JOBS_PER_CLIENT, max_active_jobs=MAX_ACTIVE_JOBS,
+                 max_runs=MAX_RUNS, max_steps=MAX_STEPS):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_jobs_per_client = max_jobs_per_client
+        self.max_active_jobs = max_active_jobs
+        self.max_runs = max_runs
+        self.max_steps = max_steps
+        self.queue = asyncio.Queue()  # jobs with chunks left to hand out, in turn
+        self.active = 0  # accepted jobs that have not finished
+        self.clients = set()
+        self.pool = None
+        self.server = None
+        self._tasks = []
+        self._client_numbers = itertools.count(1)
+        self._closing = False
+
+    async def start(self, host=HOST, port=PORT, path=None): # listens on host:port, or on a Unix socket at path
+        if not path and not is_loopback(host):
+            raise ValueError(f"the service only listens on loopback, not on {host}")
+        self.pool = ProcessPoolExecutor(self.workers)
+        self._tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+        if path:
+            self.server = await asyncio.start_unix_server(self.serve_client, path, limit=MAX_LINE)
+        else:
+            self.server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+        logger.info("Simulation service on %s with %d workers",
+                    ", ".join(str(s.getsockname()) for s in self.server.sockets), self.workers)
+        return self.server
+
+    async def close(self): # stops listening, drops every client and job, and shuts the pool down
+        self._closing = True
+        self.server.close()
+        for client in list(self.clients):
+            client.writer.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.server.wait_closed()
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def serve_client(self, reader, writer): # one connection: reads requests until the client goes away
+        client = Client(writer, f"client {next(self._client_numbers)}")
+        self.clients.add(client)
+        logger.info("%s connected", client.name)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    client.send({"event": "error", "reason": f"requests are limited to {MAX_LINE} bytes"})
+                    break
+                if not line:
+                    break
+                self.handle(client, line)
+                await writer.drain()  # a client that does not read its replies is not read from either
+        except ConnectionError:
+            pass
+        finally:
+            for job in list(client.jobs.values()):
+                self.finish(job, None)  # nobody is left to tell
+            self.clients.discard(client)
+            writer.close()
+            logger.info("%s disconnected", client.name)
+
+    def handle(self, client, line):
+        try:
+            request = json.loads(line)
+            op = request["op"]
+        except (ValueError, KeyError, TypeError):
+            client.send({"event": "error", "reason": "expected a JSON object with an op"})
+            return
+
+        if op == "submit":
+            self.submit(client, request)
+        elif op == "cancel":
+            name = request.get("job")
+            job = client.jobs.get(name) if isinstance(name, (str, int)) else None
+            if job is None:
+                client.send({"event": "error", "job": request.get("job"), "reason": "no such unfinished job"})
+            else:
+                self.finish(job, "cancelled")  # a queued job is skipped, a running chunk's games are ignored
+        elif op == "status":
+            client.send({"event": "status", "queued": self.queue.qsize(), "active": self.active,
+                         "jobs": list(client.jobs)})
+        else:
+            client.send({"event": "error", "reason": f"unknown op {op!r}"})
+
+    def submit(self, client, request):
+        name = request["job"] if "job" in request else str(next(client.job_numbers))
+        reason = None
+        if not isinstance(name, (str, int)):
+            reason = "a job name must be a string or an integer"
+        elif name in client.jobs:
+            reason = "a job with this name is still running"
+        elif len(client.jobs) >= self.max_jobs_per_client:
+            reason = f"at most {self.max_jobs_per_client} unfinished jobs per client"
+        elif self.active >= self.max_active_jobs:
+            reason = "the service is busy, try again later"
+        else:
+            try:
+                job = Job(client, name, *parse_job(request, self.max_runs))
+            except ValueError as e:
+                reason = str(e)
+        if reason:
+            client.send({"event": "rejected", "job": name, "reason": reason})
+            return
+
+        client.jobs[name] = job
+        self.active += 1
+        self.queue.put_nowait(job)
+        logger.debug("%s submitted %r: %d runs on %dx%d", client.name, name, job.runs, job.width, job.height)
+        client.send({"event": "accepted", "job": name, "seed": job.seed, "runs": job.runs,
+                     "queued": self.queue.qsize()})
+
+    def finish(self, job, event, **extra): # ends a job once, telling its client unless event is None
+        if job.finished:
+            return
+        job.finished = True
+        del job.client.jobs[job.name]
+        self.active -= 1
+        if event:
+            job.client.send(dict(job.report(event), **extra))
+
+    async def work(self): # one per pool worker: plays the next chunk of the job at the front of the queue
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            if job.finished:
+                continue  # cancelled while it waited
+            first = job.next_run
+            last = job.next_run = min(first + job.chunk_size(), job.runs)
+            if last < job.runs:
+                self.queue.put_nowait(job)  # back of the line, its next chunk can start on another worker
+            pool = self.pool
+            try:
+                steps, unfinished, seconds = await loop.run_in_executor(
+                    pool, run_chunk, job.width, job.height, job.positions, job.seed, first, last, self.max_steps)
+            except asyncio.CancelledError:
+                if self._closing:
+                    raise
+                # The chunk was dropped from a broken pool, this worker carries on with the next job
+                logger.warning("Job %r of %s lost a chunk to a restarted worker pool", job.name, job.client.name)
+                self.finish(job, "error", reason="a worker process died")
+                continue
+            except Exception as e:
+                logger.exception("Job %r of %s failed", job.name, job.client.name)
+                if isinstance(e, BrokenProcessPool) and self.pool is pool:  # only the first to notice replaces it
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self.pool = ProcessPoolExecutor(self.workers)
+                self.finish(job, "error", reason=str(e))
+                continue
+            if job.finished:
+                continue  # cancelled or failed while the chunk ran
+            job.timed_games += last - first
+            job.timed_seconds += seconds
+            done = job.done
+            job.add(first, last, steps, unfinished)
+            if job.done == job.runs:
+                self.finish(job, "done")
+            elif job.done > done:  # nothing new to report while an earlier chunk is still running
+                job.client.send(job.report("progress"), final=False)
+
+
+async def run_job(width, height, positions, runs=1, seed=None, host=HOST, port=PORT, path=None,
+                  on_progress=None): # submits one job to a running service and returns its "done" message
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+    try:  # cancelling this coroutine closes the connection, which cancels the job
+        request = {"op": "submit", "job": 1, "width": width, "height": height,
+                   "positions": [list(position) for position in positions], "runs": runs, "seed": seed}
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("the simulation service closed the connection")
+            message = json.loads(line)
+            if message["event"] == "done":
+                return message
+            if message["event"] in ("rejected", "error", "cancelled"):
+                raise RuntimeError(f"job {message['event']}: {message.get('reason', '')}")
+            if message["event"] == "progress" and on_progress:
+                on_progress(message)
+    finally:
+        writer.close()
+
+
+async def serve(host, port, path, workers): # runs the service until interrupted
+    service = SimulationService(workers)
+    server = await service.start(host, port, path)
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Wandering in the Woods simulation service.")
+    parser.add_argument("--host", default=HOST, help="loopback address to use, e.g. ::1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--socket", help="use a Unix socket at this path instead of TCP")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_command = commands.add_parser("serve", help="run the service")
+    serve_command.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    run_command = commands.add_parser("run", help="play games on a running service and print the summary")
+    run_command.add_argument("width", type=int)
+    run_command.add_argument("height", type=int)
+    run_command.add_argument("positions", nargs="+", help="start cell of each player as x,y")
+    run_command.add_argument("--runs", type=int, default=1000)
+    run_command.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    if not is_loopback(args.host):
+        parser.error(f"--host must be a loopback address, not {args.host}")
+
+    if args.command == "serve":
+        configure_logging()
+        try:
+            asyncio.run(serve(args.host, args.port, args.socket, args.workers))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    positions = [tuple(int(part) for part in position.split(",")) for position in args.positions]
+
+    def progress(message):
+        print(f"\r{message['done']}/{message['runs']} games", end="", file=sys.stderr, flush=True)
+
+    try:
+        result = asyncio.run(run_job(args.width, args.height, positions, args.runs, args.seed, args.host, args.port,
+                                     args.socket, progress))
+    except (OSError, RuntimeError) as e:
+        print(file=sys.stderr)
+        print(e, file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    for field, value in result["summary"].items():
+        print(f"{field + ':':<18} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import random
+from array import array
+from collections import namedtuple
+
+# Pure-Python rules of the walk: no pygame imports so games can run headless on batch machines.
+# The GUI in game.py drives the same Simulation, so both modes share one set of rules and Stats accounting.
+
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # The four moves a group picks from
+
+SimulationResult = namedtuple("SimulationResult", ["steps", "meetings", "seed"])
+
+BLOCK_BITS = 64  # each block of random bits holds 32 two-bit directions
+BUFFER_BLOCKS = 64  # blocks drawn from the generator at a time
+_UNPACK = [bytes((byte >> shift) & 3 for shift in (0, 2, 4, 6)) for byte in range(256)]  # byte -> 4 directions
+_REVERSE = bytes([1, 0, 3, 2]) + bytes(range(4, 256))  # translate() table turning every move into its opposite
+
+
+class DirectionSource:  # a game's seeded stream of DIRECTIONS indices, pre-generated in blocks
+    def __init__(self, seed, mirrored=False):
+        self.rng = random.Random(seed)
+        self.mirrored = mirrored  # every move reversed: the antithetic twin of the same seed's stream
+        self._buffer = b""  # unused directions, one byte (0-3) each
+        self._position = 0
+
+    def _refill(self, count): # unpacks successive getrandbits(64) blocks, lowest two bits first, until count are left
+        blocks = max(BUFFER_BLOCKS, -(-(count - len(self._buffer) + self._position) // (BLOCK_BITS // 2)))
+        raw = self.rng.getrandbits(BLOCK_BITS * blocks).to_bytes(BLOCK_BITS * blocks // 8, "little")
+        directions = b"".join(map(_UNPACK.__getitem__, raw))
+        if self.mirrored:
+            directions = directions.translate(_REVERSE)
+        self._buffer = self._buffer[self._position:] + directions
+        self._position = 0
+
+    def take(self, count): # the next count directions, as bytes; the stream does not depend on how it is split
+        if self._position + count > len(self._buffer):
+            self._refill(count)
+        start = self._position
+        self._position = start + count
+        return self._buffer[start:start + count]
+
+
+class Walker:  # one player of a Population: a view holding no state of its own
+    __slots__ = ("population", "index")
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+
+    @property
+    def player_id(self):
+        return self.index + 1
+
+    @property
+    def x(self):
+        population = self.population
+        return population.xs[population.leader[self.index]]
+
+    @property
+    def y(self):
+        population = self.population
+        return population.ys[population.leader[self.index]]
+
+
+class Population:  # every player as entries in flat arrays, so crowds of thousands stay small
+    view = Walker  # class of the objects handed out for single players
+
+    def __init__(self, positions):
+        # A group shares one cell, so only its leader's entries in xs / ys are kept up to date: a move writes
+        # one position per group, however many players it holds
+        self.xs = array("i", (x for x, _ in positions))
+        self.ys = array("i", (y for _, y in positions))
+        self.leader = array("i", range(len(self.xs)))  # index of the player whose position each one shares
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, index): # a view of one player (players are numbered index + 1)
+        if index < 0:
+            index += len(self.xs)
+        if not 0 <= index < len(self.xs):
+            raise IndexError("player index out of range")
+        return self.view(self, index)
+
+    def __iter__(self):
+        view = self.view
+        return (view(self, i) for i in range(len(self.xs)))
+
+    def positions(self): # (x, y) of every player, in player order
+        xs, ys = self.xs, self.ys
+        return [(xs[i], ys[i]) for i in self.leader]
+
+
+class DisjointSet:  # union-find over player indices, used to merge groups in near-constant time
+    def __init__(self, size):
+        self.parent = array("i", range(size))
+        self.size = array("i", [1]) * size
+        self.count = size  # number of separate groups
+
+    def find(self, i): # root of i's group (with path halving)
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a, b): # joins two groups, returns (kept root, absorbed root)
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a, None
+        if self.size[a] < self.size[b]:
+            a, b = b, a  # union by size
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.count -= 1
+        return a, b
+
+
+class Simulation:
+    def __init__(self, grid_width, grid_height, players, stats=None, seed=None, mirrored=False):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.players = players  # Population the moves are written to (game.py's draws straight from it)
+
+        # Groups are keyed by their union-find root, which is also the leader whose position the group shares,
+        # and hold player indices (leader first)
+        self.union_find = DisjointSet(len(players))
+        self._members = {i: [i] for i in range(len(players))}
+        self._cells = {}  # y * width + x -> root of the group standing there
+        self._moved = []  # (root, old cell) of groups that moved since the last collision check
+        for i, (x, y) in enumerate(players.positions()):
+            self._occupy(i, y * grid_width + x)  # players placed on the same cell start as one group
+
+        self.stats = stats
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.directions = DirectionSource(self.seed, mirrored)  # Per-game RNG so a seed reproduces the run
+
+        self.steps = 0  # Ticks where at least one group actually moved (what Stats counts)
+        self.ticks = 0  # Every movement cycle, including ones where everyone hit a wall
+        self.meetings = []  # (step, player ids of the merged group) each time groups meet
+        self.finished = False
+        self.recorder = None  # replay.MoveRecorder writing down every move, if attached
+
+    @classmethod
+    def from_positions(cls, grid_width, grid_height, player_positions, stats=None, seed=None):  # headless setup
+        return cls(grid_width, grid_height, Population(player_positions), stats=stats, seed=seed)
+
+    @property
+    def members(self): # current groups: leader index -> player indices, leader first
+        return self._members
+
+    @property
+    def occupied(self): # (x, y) cells with a group on them, as of the last collision check
+        width = self.grid_width
+        return [(cell % width, cell // width) for cell in self._cells]
+
+    @property
+    def groups(self): # current groups as lists of player views
+        players = self.players
+        return [[players[i] for i in members] for members in self._members.values()]
+
+    @property
+    def leaders(self): # one player view per group, the one whose position the group shares
+        players = self.players
+        return [players[root] for root in self._members]
+
+    def _occupy(self, root, cell): # puts a group on a cell, merging with whoever is already there
+        other = self._cells.get(cell)
+        if other is None or other == root:
+            self._cells[cell] = root
+            return root, False
+
+        kept, absorbed = self.union_find.union(other, root)  # the bigger group keeps its root and leader
+        absorbed = self._members.pop(absorbed)
+        leader = self.players.leader
+        for i in absorbed:  # union by size: a player changes leader at most log2(players) times
+            leader[i] = kept
+        self._members[kept].extend(absorbed)
+        self._cells[cell] = kept
+        return kept, True
+
+    def move_groups(self):  # moves every group one cell, returns True if anyone moved
+        return self.apply_moves(self.directions.take(len(self._members)))
+
+    def apply_moves(self, directions):  # moves the groups by DIRECTIONS indices, one per group in group order
+        if self.recorder:
+            self.recorder.record(self, directions)
+        xs, ys = self.players.xs, self.players.ys
+        width, height = self.grid_width, self.grid_height
+        moved = self._moved
+        step_made = False
+        for root, direction in zip(self._members, directions):
+            x, y = xs[root], ys[root]
+            dx, dy = DIRECTIONS[direction]
+            new_x, new_y = x + dx, y + dy
+
+            # Stay put if the move would leave the grid
+            if 0 <= new_x < width and 0 <= new_y < height:
+                moved.append((root, y * width + x))
+                xs[root] = new_x  # the rest of the group follows through Population.leader
+                ys[root] = new_y
+                step_made = True
+
+        self.ticks += 1
+        if step_made:  # Only count a step if a leader moved
+            self.steps += 1
+            if self.stats:
+                self.stats.increment_steps()
+        return step_made
+
+    def check_collisions(self):  # merges groups standing on the same cell, returns True when the game is over
+        moved, self._moved = self._moved, []
+        xs, ys, width = self.players.xs, self.players.ys, self.grid_width
+
+        # Only groups that moved can cause a meeting: vacate their old cells first, then occupy the new ones
+        for root, old_cell in moved:
+            if self._cells.get(old_cell) == root:
+                del self._cells[old_cell]
+
+        met = []
+        for root, _ in moved:
+            kept, merged = self._occupy(root, ys[root] * width + xs[root])
+            if merged:
+                met.append(kept)
+
+        for root in {self.union_find.find(root) for root in met}:  # one meeting per merged group
+            self.meetings.append((self.steps, tuple(sorted(i + 1 for i in self._members[root]))))
+
+        if self.union_find.count == 1 and not self.finished:  # Everyone is together (covers K-2 and 3-8)
+            self.finished = True
+            if self.stats:
+                self.stats.record_step_run(self.steps)
+        return self.finished
+
+    def snapshot(self):  # groups as (root, cell, member indices) in group order, see restore()
+        xs, ys = self.players.xs, self.players.ys
+        return [(root, (xs[root], ys[root]), list(members)) for root, members in self._members.items()]
+
+    def restore(self, groups, steps, ticks, meetings=()):  # puts the game back to a snapshot() taken between steps
+        xs, ys, leader = self.players.xs, self.players.ys, self.players.leader
+        self.union_find = DisjointSet(len(self.players))
+        self._members, self._cells, self._moved = {}, {}, []
+        for root, (x, y), members in groups:
+            self._members[root] = list(members)
+            for i in members:
+                xs[i], ys[i] = x, y
+                leader[i] = root
+                self.union_find.parent[i] = root
+            self.union_find.size[root] = len(members)
+            self._cells[y * self.grid_width + x] = root
+        self.union_find.count = len(groups)
+
+        self.steps, self.ticks = steps, ticks
+        self.meetings = list(meetings)
+        self.finished = self.union_find.count == 1
+
+    def step(self):  # one full movement cycle
+        self.move_groups()
+        return self.check_collisions()
+
+    def run(self, max_steps=None):  # runs to completion as fast as possible
+        if self.stats:
+            self.stats.start_timer()
+
+        while not self.finished and (max_steps is None or self.steps < max_steps):
+            self.step()
+
+        if self.stats and self.finished:
+            self.stats.stop_timer()
+        return SimulationResult(self.steps, list(self.meetings), self.seed)
+
+
+def simulate(grid_width, grid_height, player_positions, stats=None, seed=None, max_steps=None):  # one headless game
+    sim = Simulation.from_positions(grid_width, grid_height, player_positions, stats=stats, seed=seed)
+    return sim.run(max_steps)
@@ -1,50 +1,195 @@
+import bisect
+import math
 import time
 
 
+class RunningSummary: # count, mean, variance (Welford), min and max in O(1) memory
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def total(self):
+        return self.mean * self.count
+
+    @property
+    def variance(self): # sample variance
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch: # P-square estimate of one quantile using five markers (Jain & Chlamtac)
+    def __init__(self, p):
+        self.p = p
+        self.heights = []  # marker heights, the first five values are kept exactly
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            bisect.insort(heights, value)
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(heights, value) - 1  # heights[k] <= value < heights[k + 1]
+
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):  # nudge the middle markers towards their desired positions
+            d = self.desired[i] - self.positions[i]
+            if (d >= 1 and self.positions[i + 1] - self.positions[i] > 1) or \
+                    (d <= -1 and self.positions[i - 1] - self.positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, d)
+                heights[i] = height
+                self.positions[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    def value(self): # current estimate (exact while fewer than five values have been seen)
+        if not self.heights:
+            return 0
+        if len(self.heights) < 5:
+            return self.heights[min(len(self.heights) - 1, round(self.p * (len(self.heights) - 1)))]
+        return self.heights[2]
+
+
+class Histogram: # fixed number of log-spaced buckets, bucket 0 holds everything below `smallest`
+    def __init__(self, smallest=1, buckets_per_doubling=4, bucket_count=96):
+        self.smallest = smallest
+        self.buckets_per_doubling = buckets_per_doubling
+        self.counts = [0] * bucket_count
+
+    def bucket(self, value): # index of the bucket a value falls in
+        if value < self.smallest:
+            return 0
+        index = int(math.log2(value / self.smallest) * self.buckets_per_doubling) + 1
+        return min(index, len(self.counts) - 1)
+
+    def bounds(self, index): # [low, high) covered by a bucket
+        if index == 0:
+            return 0, self.smallest
+        low = self.smallest * 2 ** ((index - 1) / self.buckets_per_doubling)
+        high = self.smallest * 2 ** (index / self.buckets_per_doubling)
+        return low, (high if index < len(self.counts) - 1 else math.inf)
+
+    def add(self, value):
+        self.counts[self.bucket(value)] += 1
+
+    def items(self): # (low, high, count) for every non-empty bucket
+        return [self.bounds(i) + (count,) for i, count in enumerate(self.counts) if count]
+
+
+class RunDistribution: # everything we track about one per-game measurement, updated in O(1) per game
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, smallest=1):
+        self.summary = RunningSummary()
+        self.sketches = {p: QuantileSketch(p / 100) for p in self.PERCENTILES}
+        self.histogram = Histogram(smallest)
+
+    def add(self, value):
+        self.summary.add(value)
+        for sketch in self.sketches.values():
+            sketch.add(value)
+        self.histogram.add(value)
+
+    def percentile(self, p): # approximate p-th percentile, p in PERCENTILES
+        return self.sketches[p].value()
+
+    def percentiles(self):
+        return {p: sketch.value() for p, sketch in self.sketches.items()}
+
+
 class Stats:
     def __init__(self):
         self.total_steps = 0  # Total steps taken in the game
-        self.step_runs = []  # List to store step runs before each meeting
-        self.run_times = []  # Store the time duration of each game
+        self.step_runs = RunDistribution()  # Steps taken before all players met, one value per game
+        self.run_times = RunDistribution(smallest=0.01)  # Duration of each game in seconds
         self.start_time = None  # Track when the game starts
+        self.last_run_time = None  # Duration of the most recent game in seconds
 
     def increment_steps(self): #increase the step counter
           self.total_steps += 1
 
     def record_step_run(self, steps): # records the number of steps before players meet
-     self.step_runs.append(steps)
+     self.step_runs.add(steps)
 
     def get_total_steps(self): # returnes total number of steps
         return self.total_steps
 
+    def get_total_runs(self): # number of finished games that were timed
+        return self.run_times.summary.count
+
     def start_timer(self): # starts timer
         if self.start_time is None:
-            self.start_time = time.time()
+            self.start_time = time.perf_counter()
 
 
     def stop_timer(self): #stops timer and stores time
-        if self.start_time:
-            elapsed_time = round(time.time() - self.start_time, 2)  # Calculate duration
-            self.run_times.append(elapsed_time)
+        if self.start_time is not None:
+            elapsed_time = time.perf_counter() - self.start_time  # Calculate duration
+            self.run_times.add(elapsed_time)
+            self.last_run_time = elapsed_time
 
             self.start_time = None  # Reset timer
 
 
     def get_longest_run(self): #return longest run
-        return max(self.run_times, default=0)
+        return round(self.run_times.summary.max or 0, 2)
 
     def get_shortest_run(self): #return shortest times
-        return min(self.run_times, default=0)
+        return round(self.run_times.summary.min or 0, 2)
 
     def get_average_run_time(self): #average run time
-        if not self.run_times:
-            return 0
-        return round(sum(self.run_times) / len(self.run_times), 2)
+        return round(self.run_times.summary.mean, 2)
+
+    def get_run_time_percentiles(self): # approximate p50/p95/p99 of run times in seconds
+        return {p: round(value, 2) for p, value in self.run_times.percentiles().items()}
+
+    def get_longest_steps(self): # most steps any game took
+        return self.step_runs.summary.max or 0
+
+    def get_shortest_steps(self): # fewest steps any game took
+        return self.step_runs.summary.min or 0
 
-    def save_stats(self, filename="game_stats.txt"):
+    def get_average_steps(self): # mean steps per game
+        return round(self.step_runs.summary.mean, 2)
 
-        with open(filename, "w") as file:
-            file.write(f"Total Runs: {len(self.run_times)}\n")
-            file.write(f"Longest Run: {self.get_longest_run()} seconds\n")
-            file.write(f"Shortest Run: {self.get_shortest_run()} seconds\n")
-            file.write(f"Average Run Time: {self.get_average_run_time()} seconds\n")
+    def get_step_percentiles(self): # approximate p50/p95/p99 of steps per game
+        return self.step_runs.percentiles()
@@ -0,0 +1,122 @@
+### Monte Carlo sweep over grid sizes and player counts ###
+
+# Runs headless games (simulation.Simulation) on every core and prints step-count statistics per configuration.
+# Every run gets its own seed derived from the master seed, so results do not depend on the number of workers.
+#
+# Example: python sweep.py --widths 5-20 --heights 5-20 --players 2-4 --runs 1000 --seed 42 --csv sweep.csv
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation import simulate
+
+CHUNK_SIZE = 250  # runs per task sent to a worker
+
+
+def parse_range(text):  # "5-20" or "5,6,10" or "6" -> list of ints
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            values.extend(range(int(low), int(high) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+def run_seed(master_seed, width, height, players, run): # seed of one run, independent of scheduling
+    return random.Random(f"{master_seed}:{width}x{height}:{players}:{run}").getrandbits(64)
+
+
+def corner_cells(width, height, players): # the first `players` corners, None if there are not that many distinct ones
+    cells = [(0, 0), (width - 1, height - 1), (0, height - 1), (width - 1, 0)][:players]
+    return cells if len(cells) == players and len(set(cells)) == players else None
+
+
+def start_positions(width, height, players, rng, corners=False): # distinct starting cells for one run
+    if corners:
+        cells = corner_cells(width, height, players)
+        if cells is None:
+            raise ValueError(f"a {width}x{height} grid does not have {players} distinct corners")
+        return cells
+    return [(cell % width, cell // width) for cell in rng.sample(range(width * height), players)]
+
+
+def run_chunk(task):  # worker: plays runs [first, last) of one configuration
+    master_seed, width, height, players, first, last, corners = task
+    steps = []
+    for run in range(first, last):
+        seed = run_seed(master_seed, width, height, players, run)
+        positions = start_positions(width, height, players, random.Random(seed), corners)
+        steps.append(simulate(width, height, positions, seed=seed).steps)
+    return (width, height, players), steps
+
+
+def summarize(steps): # per-configuration statistics
+    return {
+        "runs": len(steps),
+        "mean": statistics.fmean(steps),
+        "stdev": statistics.stdev(steps) if len(steps) > 1 else 0.0,
+        "min": min(steps),
+        "median": statistics.median(steps),
+        "max": max(steps),
+    }
+
+
+def sweep(widths, heights, player_counts, runs, master_seed=0, workers=None, corners=False):
+    configs = [(w, h, p) for w in widths for h in heights for p in player_counts if p <= w * h]
+    tasks = [(master_seed, w, h, p, first, min(first + CHUNK_SIZE, runs), corners)
+             for w, h, p in configs for first in range(0, runs, CHUNK_SIZE)]
+
+    results = {config: [] for config in configs}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for config, steps in pool.map(run_chunk, tasks):  # map keeps task order, so output is deterministic
+            results[config].extend(steps)
+
+    return {config: summarize(steps) for config, steps in results.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep of Wandering in the Woods meeting times.")
+    parser.add_argument("--widths", default="5-20", help="grid widths, e.g. 5-20 or 5,10,20")
+    parser.add_argument("--heights", default="5-20", help="grid heights, e.g. 5-20 or 5,10,20")
+    parser.add_argument("--players", default="2-4", help="player counts, e.g. 2-4")
+    parser.add_argument("--runs", type=int, default=1000, help="games per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--corners", action="store_true", help="start players in the corners instead of at random")
+    parser.add_argument("--csv", help="also write the results to this CSV file")
+    args = parser.parse_args(argv)
+
+    widths, heights, player_counts = parse_range(args.widths), parse_range(args.heights), parse_range(args.players)
+    if args.corners:
+        bad = [(w, h, p) for w in widths for h in heights for p in player_counts
+               if p <= w * h and corner_cells(w, h, p) is None]
+        if bad:
+            w, h, p = bad[0]
+            parser.error(f"--corners needs a distinct corner per player, but a {w}x{h} grid does not have {p} "
+                         f"(at most 4 players, on grids at least 2x2)")
+
+    summary = sweep(widths, heights, player_counts, args.runs, args.seed, args.workers, args.corners)
+
+    fields = ["runs", "mean", "stdev", "min", "median", "max"]
+    print(f"{'grid':>7} {'players':>7} " + " ".join(f"{field:>9}" for field in fields))
+    for (width, height, players), row in summary.items():
+        print(f"{f'{width}x{height}':>7} {players:>7} " + " ".join(f"{row[field]:>9.6g}" for field in fields))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["width", "height", "players"] + fields)
+            for (width, height, players), row in summary.items():
+                writer.writerow([width, height, players] + [row[field] for field in fields])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())